@@ -12,25 +12,43 @@ Features:
 """
 
 import os
+import io
 import subprocess
 import tempfile
 import shutil
+import stat
 import logging
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any, Callable
+from typing import Optional, Tuple, Dict, Any, Callable, Union, TextIO, Literal, List
 import sys
 import time
 import re
+import bisect
 import json
+import concurrent.futures
+import functools
+import threading
+import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
 
-# Try to import whisper
+import numpy as np
+
+# Try to import faster-whisper (CTranslate2 backend)
 try:
-    import whisper
+    import ctranslate2
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
     WHISPER_AVAILABLE = True
 except ImportError:
     WHISPER_AVAILABLE = False
 
+# Try to import orjson (faster cache serialization)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Try to import moviepy
 try:
     from moviepy.editor import VideoFileClip
@@ -56,6 +74,236 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Local cache for converted models and other reusable artifacts
+CACHE_DIR = Path(os.environ.get('SUBGEN_CACHE_DIR', Path.home() / '.cache' / 'subgen'))
+# Opt in to building pre-quantized int8 models; this downloads the full PyTorch checkpoint once
+WHISPER_INT8_CONVERT = os.environ.get('WHISPER_INT8_CONVERT', '').lower() in ('1', 'true', 'yes')
+LANGDETECT_CACHE_DIR = CACHE_DIR / 'langdetect'
+TRANSCRIPT_CACHE_DIR = CACHE_DIR / 'transcripts'
+# Transcripts and detected languages hold user content: SUBGEN_CACHE=0 keeps none on disk,
+# otherwise each directory keeps at most CACHE_MAX_ENTRIES files, none older than CACHE_TTL seconds
+CACHE_ENABLED = os.environ.get('SUBGEN_CACHE', '1').lower() not in ('0', 'false', 'no')
+CACHE_MAX_ENTRIES = int(os.environ.get('SUBGEN_CACHE_MAX_ENTRIES', '500'))
+CACHE_TTL = int(os.environ.get('SUBGEN_CACHE_TTL', str(7 * 24 * 3600)))
+
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    _json_loads = json.loads
+
+def _audio_fingerprint(audio) -> str:
+    """Cache key for an audio file or sample array: BLAKE2b of its full contents
+    
+    The whole buffer is hashed because clips sharing an opening (intros, silence) must not
+    share a cached transcript.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    if isinstance(audio, str):
+        with open(audio, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    else:
+        digest.update(np.ascontiguousarray(audio).tobytes())
+    return digest.hexdigest()
+
+def _read_cache_file(cache_dir: Path, cache_key: str) -> Optional[bytes]:
+    """Contents of a cache entry, or None if caching is off or the entry is missing or expired
+    
+    A hit refreshes the entry's mtime, so pruning drops the least recently used entries first.
+    """
+    if not CACHE_ENABLED:
+        return None
+    cache_file = cache_dir / f"{cache_key}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime > CACHE_TTL:
+            return None
+        data = cache_file.read_bytes()
+        os.utime(cache_file)
+        return data
+    except FileNotFoundError:
+        return None
+
+def _write_cache_file(cache_dir: Path, cache_key: str, data: bytes):
+    """Write a cache entry atomically, then prune cache_dir to CACHE_MAX_ENTRIES and CACHE_TTL
+    
+    The temp file plus os.replace means concurrent jobs on the same audio never see partial JSON.
+    """
+    if not CACHE_ENABLED:
+        return
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, cache_dir / f"{cache_key}.json")
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    
+    now = time.time()
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith('.json'):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+    entries.sort()
+    excess = len(entries) - CACHE_MAX_ENTRIES
+    for index, (mtime, path) in enumerate(entries):
+        if index < excess or now - mtime > CACHE_TTL:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+# Precompiled patterns for the per-segment text cleanup paths
+_WS = re.compile(r'\s+')
+_DEVANAGARI = re.compile(r'[\u0900-\u097F]')
+_DEVANAGARI_OR_WORD = re.compile(r'[\u0900-\u097F\w]')
+_PUNCT_SPACE = re.compile(r'\s*([,.!?])\s*')
+_SPACE_BEFORE_PUNCT = re.compile(r'\s+([,.!?])')
+_SENT_CAP = re.compile(r'([.!?]\s+)([a-z])')
+_SENT_SPLIT = re.compile(r'([.!?]\s*)')
+_SENT_END = re.compile(r'[.!?]\s*')
+_SRT_TIME = re.compile(r'(\d{2}:\d{2}:\d{2}),(\d{3}) --> (\d{2}:\d{2}:\d{2}),(\d{3})')
+_REPEAT_PUNCT = re.compile(r'([.!?])\s*([.!?])+')
+_ONLY_NONWORD = re.compile(r'^[\s\d\W]+$')
+
+def _fmt_ts(seconds: float, _int=int, _divmod=divmod) -> str:
+    """Format seconds as an SRT timestamp (HH:MM:SS,mmm); expects a non-negative number"""
+    ms = _int(seconds * 1000)
+    s, ms = _divmod(ms, 1000)
+    m, s = _divmod(s, 60)
+    h, m = _divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+def _srt_time_ms(hms: str, ms: str) -> int:
+    """Milliseconds for the HH:MM:SS and mmm parts of an SRT timestamp"""
+    h, m, s = hms.split(':')
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(ms)
+
+def _fmt_ts_safe(seconds) -> str:
+    """Format an SRT timestamp, replacing invalid or negative values with 0"""
+    if not isinstance(seconds, (int, float)) or seconds < 0:
+        logger.warning(f"Invalid timestamp: {seconds}, using 0")
+        seconds = 0
+    return _fmt_ts(seconds)
+
+# Parser states for streaming SRT blocks in create_styled_ass_file
+_SRT_WAIT_INDEX, _SRT_WAIT_TIME, _SRT_WAIT_TEXT, _SRT_SKIP_BLOCK = range(4)
+
+# Common corrections for Hindi/Hinglish
+_CORRECTIONS = {
+    # English words commonly mistranscribed
+    'और': 'aur',  # Keep 'and' in romanized form for Hinglish
+    'है ना': 'hai na',
+    'क्या': 'kya',
+    'कैसे': 'kaise',
+    'अच्छा': 'accha',
+    'बहुत': 'bahut',
+    'थोड़ा': 'thoda',
+    
+    # Common misheard words
+    'theek': 'thik',
+    'paani': 'pani',
+    
+    # Fix spacing issues
+    'kar na': 'karna',
+    'ja na': 'jana',
+    'aa na': 'aana',
+}
+# Longest keys first so overlapping corrections prefer the longest match
+_CORR_RE = re.compile('|'.join(re.escape(k) for k in sorted(_CORRECTIONS, key=len, reverse=True)))
+
+def _build_indicator_matcher(indicators, romanization_map):
+    """Build a single-pass matcher for indicator words and their romanized variants.
+    
+    The lookahead alternation reports the longest variant starting at each
+    position; every indicator whose variant is a prefix of that match is
+    credited, so the result equals testing each variant as a substring.
+    """
+    variant_words = {}
+    for word in indicators:
+        for variant in (word, romanization_map.get(word, word)):
+            variant_words.setdefault(variant, set()).add(word)
+    
+    credits = {
+        variant: frozenset(word for prefix, words in variant_words.items() if variant.startswith(prefix) for word in words)
+        for variant in variant_words
+    }
+    pattern = re.compile('(?=(' + '|'.join(re.escape(v) for v in sorted(variant_words, key=len, reverse=True)) + '))')
+    return pattern, credits
+
+# ASS colours (&HBBGGRR) for the named colours the UI offers
+_ASS_COLORS = {
+    'white': '&Hffffff',
+    'black': '&H000000',
+    'red': '&H0000ff',
+    'green': '&H00ff00',
+    'blue': '&Hff0000',
+    'yellow': '&H00ffff',
+    '#ffffff': '&Hffffff',
+    '#000000': '&H000000'
+}
+
+def _color_to_ass(color: str) -> str:
+    """Convert color name or hex to ASS format"""
+    # Handle hex colors (e.g., #ffffff)
+    if color.startswith('#'):
+        hex_color = color[1:]
+        if len(hex_color) == 6:
+            # Convert RGB to BGR for ASS format
+            r = hex_color[0:2]
+            g = hex_color[2:4]
+            b = hex_color[4:6]
+            return f'&H{b}{g}{r}'
+    
+    # Handle named colors
+    return _ASS_COLORS.get(color.lower(), '&Hffffff')
+
+
+# Style strings depend only on the font fields, so each combination is formatted once per process
+@functools.lru_cache(maxsize=32)
+def _build_force_style(family: str, size: int, color: str, outline_color: str,
+                       bold: bool, italic: bool, shadow: bool) -> str:
+    """FFmpeg force_style string for the subtitles filter"""
+    style_parts = [
+        f"FontName={family}",
+        f"FontSize={size}",
+        f"PrimaryColour={_color_to_ass(color)}",
+        f"OutlineColour={_color_to_ass(outline_color)}"
+    ]
+    if bold:
+        style_parts.append("Bold=1")
+    if italic:
+        style_parts.append("Italic=1")
+    if shadow:
+        style_parts.append("Shadow=2")
+    return ','.join(style_parts)
+
+@functools.lru_cache(maxsize=32)
+def _build_ass_header(family: str, size: int, color: str, outline_color: str,
+                      bold: bool, italic: bool, shadow: bool) -> str:
+    """ASS script header with a Default style for these font fields"""
+    return f"""[Script Info]
+Title: Generated Subtitles
+ScriptType: v4.00+
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,{family},{size},{_color_to_ass(color)},&H000000ff,{_color_to_ass(outline_color)},&H80000000,{1 if bold else 0},{1 if italic else 0},0,0,100,100,0,0,1,2,{2 if shadow else 0},2,10,10,10,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
 @dataclass
 class FontSettings:
     """Font configuration for subtitle styling"""
@@ -67,45 +315,21 @@ class FontSettings:
     italic: bool = False
     shadow: bool = True
     
+    def _style_fields(self) -> tuple:
+        """Hashable tuple of the fields that determine the subtitle style"""
+        return (self.family, self.size, self.color, self.outline_color, self.bold, self.italic, self.shadow)
+    
     def to_ffmpeg_style(self) -> str:
         """Convert font settings to FFmpeg subtitle style string"""
-        style_parts = []
-        style_parts.append(f"FontName={self.family}")
-        style_parts.append(f"FontSize={self.size}")
-        style_parts.append(f"PrimaryColour={self._color_to_ass(self.color)}")
-        style_parts.append(f"OutlineColour={self._color_to_ass(self.outline_color)}")
-        if self.bold:
-            style_parts.append("Bold=1")
-        if self.italic:
-            style_parts.append("Italic=1")
-        if self.shadow:
-            style_parts.append("Shadow=2")
-        return ','.join(style_parts)
+        return _build_force_style(*self._style_fields())
     
     def _color_to_ass(self, color: str) -> str:
         """Convert color name or hex to ASS format"""
-        # Handle hex colors (e.g., #ffffff)
-        if color.startswith('#'):
-            hex_color = color[1:]
-            if len(hex_color) == 6:
-                # Convert RGB to BGR for ASS format
-                r = hex_color[0:2]
-                g = hex_color[2:4]
-                b = hex_color[4:6]
-                return f'&H{b}{g}{r}'
-        
-        # Handle named colors
-        color_map = {
-            'white': '&Hffffff',
-            'black': '&H000000',
-            'red': '&H0000ff',
-            'green': '&H00ff00',
-            'blue': '&Hff0000',
-            'yellow': '&H00ffff',
-            '#ffffff': '&Hffffff',
-            '#000000': '&H000000'
-        }
-        return color_map.get(color.lower(), '&Hffffff')
+        return _color_to_ass(color)
+    
+    def to_ass_header(self) -> str:
+        """Build the ASS script header with a Default style from these settings"""
+        return _build_ass_header(*self._style_fields())
 
 class LocalWhisperTools:
     """Enhanced Whisper tool for local transcription with improved Hindi/Hinglish support"""
@@ -141,10 +365,40 @@ class LocalWhisperTools:
         'अच्छा', 'बुरा', 'बड़ा', 'छोटा', 'नया', 'पुराना', 'सही', 'गलत'
     ]
     
-    def __init__(self, model_name: str = "base"):
-        """Initialize Whisper model with validation and Hindi/Hinglish optimization"""
+    # Simple romanization mapping for common Hindi words
+    ROMANIZATION_MAP = {
+        'है': 'hai', 'हैं': 'hain', 'था': 'tha', 'थी': 'thi',
+        'करना': 'karna', 'कर': 'kar', 'और': 'aur',
+        'का': 'ka', 'की': 'ki', 'के': 'ke', 'में': 'mein',
+        'से': 'se', 'को': 'ko', 'पर': 'par',
+        'यह': 'yah', 'वह': 'vah', 'हम': 'hum',
+        'तुम': 'tum', 'आप': 'aap', 'मैं': 'main',
+        'क्या': 'kya', 'कैसे': 'kaise', 'कहाँ': 'kahan',
+        'अच्छा': 'acha', 'बुरा': 'bura'
+    }
+    
+    # Indicator words and their romanized forms, matched in one pass over the sample
+    _INDICATOR_RE, _INDICATOR_CREDITS = _build_indicator_matcher(HINDI_INDICATORS, ROMANIZATION_MAP)
+    
+    # Minimum Whisper language probability before the detected language is trusted
+    LANGUAGE_PROBABILITY_THRESHOLD = 0.5
+    
+    # Hindi transcripts averaging below this log-probability get their weakest segments re-decoded
+    LOW_CONFIDENCE_LOGPROB = -0.8
+    MAX_REDECODE_SEGMENTS = 16
+    
+    # Models whose int8 conversion already failed in this process
+    _int8_conversion_failed = set()
+    
+    def __init__(self, model_name: str = "base", compute_type: Optional[str] = None):
+        """Initialize Whisper model with validation and Hindi/Hinglish optimization
+        
+        compute_type selects the CTranslate2 weight precision (e.g. "int8",
+        "int8_float16", "float16"). It defaults to the WHISPER_COMPUTE_TYPE environment
+        variable, then to float16 on CUDA and int8 on CPU.
+        """
         if not WHISPER_AVAILABLE:
-            raise ImportError("Whisper is not available. Install it with: pip install openai-whisper")
+            raise ImportError("Whisper is not available. Install it with: pip install faster-whisper")
         
         if model_name not in self.SUPPORTED_MODELS:
             logger.warning(f"Model '{model_name}' not in supported models {self.SUPPORTED_MODELS}. Proceeding anyway.")
@@ -153,61 +407,113 @@ class LocalWhisperTools:
         if model_name in ['tiny', 'base']:
             logger.warning("For better Hindi/Hinglish accuracy, consider using 'small' or larger models")
         
+        self.model_name = model_name
+        self.name = "local_whisper_tools"
+        self.device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        default_compute_type = "float16" if self.device == "cuda" else "int8"
+        self.compute_type = compute_type or os.environ.get('WHISPER_COMPUTE_TYPE') or default_compute_type
+        if self.compute_type not in ctranslate2.get_supported_compute_types(self.device):
+            logger.warning(f"Compute type '{self.compute_type}' not supported on {self.device}, using {default_compute_type}")
+            self.compute_type = default_compute_type
+        
+        # Load weights in the background so audio extraction can overlap with it
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._load_future = executor.submit(self._load_model)
+        executor.shutdown(wait=False)
+    
+    def _load_model(self):
+        """Load the CTranslate2 Whisper model and wrap it in the batched pipeline"""
+        model_path = self.model_name
+        if self.compute_type == "int8":
+            model_path = self._get_int8_model_path() or self.model_name
+        
+        logger.info(f"Loading Whisper model: {model_path} ({self.device}, {self.compute_type})")
+        whisper_model = WhisperModel(model_path, device=self.device, compute_type=self.compute_type)
+        logger.info(f"Successfully loaded Whisper model: {self.model_name}")
+        return whisper_model, BatchedInferencePipeline(model=whisper_model)
+    
+    def _get_int8_model_path(self) -> Optional[str]:
+        """Return a cached int8-quantized CTranslate2 model, converting it on first use
+        
+        Storing the weights pre-quantized avoids re-quantizing the float16 checkpoint
+        on every load. Conversion only runs when WHISPER_INT8_CONVERT is set, since it
+        downloads the full openai/whisper-* checkpoint and needs transformers and torch;
+        otherwise, or after a failed attempt, the stock model is used instead.
+        """
+        model_dir = CACHE_DIR / f"whisper-{self.model_name}-int8"
+        if (model_dir / "model.bin").exists():
+            return str(model_dir)
+        
+        if not WHISPER_INT8_CONVERT or self.model_name in self._int8_conversion_failed:
+            return None
+        
         try:
-            logger.info(f"Loading Whisper model: {model_name}")
-            self.model = whisper.load_model(model_name)
-            self.model_name = model_name
-            self.name = "local_whisper_tools"
-            logger.info(f"Successfully loaded Whisper model: {model_name}")
+            from ctranslate2.converters import TransformersConverter
+            
+            logger.info(f"Downloading openai/whisper-{self.model_name} and converting it to int8 in {model_dir}; "
+                        f"this happens once per model")
+            tmp_dir = model_dir.with_name(model_dir.name + ".tmp")
+            converter = TransformersConverter(
+                f"openai/whisper-{self.model_name}",
+                copy_files=["tokenizer.json", "preprocessor_config.json"]
+            )
+            converter.convert(str(tmp_dir), quantization="int8", force=True)
+            shutil.rmtree(model_dir, ignore_errors=True)
+            os.replace(tmp_dir, model_dir)
+            return str(model_dir)
+        except Exception as e:
+            # Don't retry (and re-download) on every load for the rest of the process
+            self._int8_conversion_failed.add(self.model_name)
+            logger.warning(f"Could not build cached int8 model: {e}. Using the stock model.")
+            return None
+    
+    def _wait_for_model(self):
+        """Block until the background model load has finished"""
+        try:
+            return self._load_future.result()
         except Exception as e:
-            logger.error(f"Failed to load Whisper model '{model_name}': {e}")
+            logger.error(f"Failed to load Whisper model '{self.model_name}': {e}")
             raise Exception(f"Failed to load Whisper model: {e}")
     
-    def detect_language_type(self, audio_path: str, progress_callback: Optional[Callable] = None) -> str:
+    @property
+    def whisper_model(self):
+        """Underlying faster-whisper model"""
+        return self._wait_for_model()[0]
+    
+    @property
+    def model(self):
+        """Batched inference pipeline used for transcription"""
+        return self._wait_for_model()[1]
+    
+    def detect_language_type(self, audio: Union[str, np.ndarray], progress_callback: Optional[Callable] = None) -> str:
         """Detect if audio is Hindi, Hinglish, or English using a quick sample"""
         try:
             if progress_callback:
                 progress_callback("🔍 Detecting language type...")
             
+            cache_key = _audio_fingerprint(audio)
+            cached = self._load_cached_language(cache_key)
+            if cached:
+                language_type = cached['language_type']
+                if progress_callback:
+                    progress_callback(f"🌐 Detected language: {self.LANGUAGE_CONFIGS[language_type]['name']} (cached)")
+                return language_type
+            
             # Use a quick transcription of first 30 seconds to detect language
-            quick_result = self.model.transcribe(
-                audio_path,
+            segments, info = self.whisper_model.transcribe(
+                audio,
                 language=None,  # Auto-detect
                 task="transcribe",
-                verbose=False,
                 condition_on_previous_text=False,
                 word_timestamps=False,
-                duration=30  # Only first 30 seconds
+                clip_timestamps=[0, 30]  # Only first 30 seconds
             )
+            quick_result = self._segments_to_result(segments, info)
             
-            detected_lang = quick_result.get('language', 'en')
-            text_sample = quick_result.get('text', '').lower()
-            
-            logger.info(f"Initial language detection: {detected_lang}")
-            logger.info(f"Sample text: {text_sample[:100]}...")
-            
-            # Check for Hindi script or words
-            hindi_script_count = len(re.findall(r'[\u0900-\u097F]', text_sample))
-            
-            # Check for Hindi words in romanized text
-            hindi_word_matches = sum(1 for word in self.HINDI_INDICATORS 
-                                   if any(variant in text_sample for variant in [
-                                       word, self._romanize_hindi_word(word)
-                                   ]))
-            
-            # Decision logic
-            if detected_lang == 'hi' or hindi_script_count > 10:
-                if hindi_script_count > len(text_sample) * 0.3:  # More than 30% Hindi script
-                    language_type = 'hindi'
-                else:
-                    language_type = 'hinglish'  # Mix of Hindi and English
-            elif hindi_word_matches > 3 or any(word in text_sample for word in 
-                                             ['hai', 'kar', 'kya', 'kaise', 'acha', 'bura']):
-                language_type = 'hinglish'
-            else:
-                language_type = 'english'
-            
-            logger.info(f"Detected language type: {language_type}")
+            language_type = self._classify_language_type(
+                quick_result.get('language', 'en'), quick_result.get('text', '').lower()
+            )
+            self._store_cached_language(cache_key, language_type)
             
             if progress_callback:
                 progress_callback(f"🌐 Detected language: {self.LANGUAGE_CONFIGS[language_type]['name']}")
@@ -218,38 +524,156 @@ class LocalWhisperTools:
             logger.warning(f"Language detection failed: {e}. Defaulting to hinglish.")
             return 'hinglish'
     
+    def _transcript_cache_key(self, fingerprint: str, language: Optional[str], task: str) -> str:
+        """Cache key for a transcript: the audio plus everything that changes the decode"""
+        settings = f"{fingerprint}|{self.model_name}|{self.compute_type}|{task}|{(language or 'auto').lower()}"
+        return hashlib.sha1(settings.encode()).hexdigest()
+    
+    def _load_cached_transcript(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a previously stored raw transcription result, if any"""
+        try:
+            data = _read_cache_file(TRANSCRIPT_CACHE_DIR, cache_key)
+            if data is not None:
+                cached = _json_loads(data)
+                if isinstance(cached.get('segments'), list):
+                    return cached
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable transcript cache {cache_key}: {e}")
+        return None
+    
+    def _store_cached_transcript(self, cache_key: str, result: Dict[str, Any]):
+        """Store the raw transcription result so re-runs can skip decoding"""
+        try:
+            _write_cache_file(TRANSCRIPT_CACHE_DIR, cache_key, _json_dumps({
+                'segments': [
+                    {
+                        'start': segment['start'],
+                        'end': segment['end'],
+                        'text': segment['text'],
+                        'avg_logprob': segment['avg_logprob']
+                    }
+                    for segment in result['segments']
+                ],
+                'text': result['text'],
+                'language': result['language'],
+                'language_probability': result['language_probability']
+            }))
+        except OSError as e:
+            logger.warning(f"Could not write transcript cache: {e}")
+    
+    def _load_cached_language(self, cache_key: str) -> Optional[Dict[str, str]]:
+        """Return a previously detected language for this audio fingerprint, if any"""
+        try:
+            data = _read_cache_file(LANGDETECT_CACHE_DIR, cache_key)
+            if data is not None:
+                cached = json.loads(data)
+                if cached.get('language_type') in self.LANGUAGE_CONFIGS:
+                    return cached
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable language cache {cache_key}: {e}")
+        return None
+    
+    def _store_cached_language(self, cache_key: str, language_type: str, decode_language: Optional[str] = None):
+        """Remember the detected language for this audio fingerprint
+        
+        decode_language is the code Whisper actually decoded with, so a later run can repeat it.
+        """
+        try:
+            _write_cache_file(LANGDETECT_CACHE_DIR, cache_key, json.dumps({
+                'language_type': language_type,
+                'language': self.LANGUAGE_CONFIGS[language_type]['code'],
+                'decode_language': decode_language
+            }).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Could not write language cache: {e}")
+    
+    def _classify_language_type(self, detected_lang: Optional[str], text_sample: str) -> str:
+        """Classify a transcribed sample as Hindi, Hinglish, or English"""
+        logger.info(f"Initial language detection: {detected_lang}")
+        logger.info(f"Sample text: {text_sample[:100]}...")
+        
+        # Check for Hindi script or words
+        hindi_script_count = len(_DEVANAGARI.findall(text_sample))
+        
+        # Check for Hindi words in romanized text
+        matched_indicators = set()
+        for match in self._INDICATOR_RE.finditer(text_sample):
+            matched_indicators.update(self._INDICATOR_CREDITS[match.group(1)])
+        hindi_word_matches = len(matched_indicators)
+        
+        # Decision logic
+        if detected_lang == 'hi' or hindi_script_count > 10:
+            if hindi_script_count > len(text_sample) * 0.3:  # More than 30% Hindi script
+                language_type = 'hindi'
+            else:
+                language_type = 'hinglish'  # Mix of Hindi and English
+        elif hindi_word_matches > 3 or any(word in text_sample for word in 
+                                         ['hai', 'kar', 'kya', 'kaise', 'acha', 'bura']):
+            language_type = 'hinglish'
+        else:
+            language_type = 'english'
+        
+        logger.info(f"Detected language type: {language_type}")
+        return language_type
+    
     def _romanize_hindi_word(self, hindi_word: str) -> str:
         """Simple romanization mapping for common Hindi words"""
-        romanization_map = {
-            'है': 'hai', 'हैं': 'hain', 'था': 'tha', 'थी': 'thi',
-            'करना': 'karna', 'कर': 'kar', 'और': 'aur',
-            'का': 'ka', 'की': 'ki', 'के': 'ke', 'में': 'mein',
-            'से': 'se', 'को': 'ko', 'पर': 'par',
-            'यह': 'yah', 'वह': 'vah', 'हम': 'hum',
-            'तुम': 'tum', 'आप': 'aap', 'मैं': 'main',
-            'क्या': 'kya', 'कैसे': 'kaise', 'कहाँ': 'kahan',
-            'अच्छा': 'acha', 'बुरा': 'bura'
-        }
-        return romanization_map.get(hindi_word, hindi_word)
+        return self.ROMANIZATION_MAP.get(hindi_word, hindi_word)
     
-    def transcribe_audio_local(self, audio_path: str, progress_callback: Optional[Callable] = None, 
+    def transcribe_audio_local(self, audio: Union[str, np.ndarray], progress_callback: Optional[Callable] = None, 
                               language: Optional[str] = None, task: str = "transcribe",
-                              auto_detect_language: bool = True) -> str:
-        """Transcribe audio file with enhanced Hindi/Hinglish support"""
+                              auto_detect_language: bool = True, ass_path: Optional[str] = None,
+                              font_settings: Optional[FontSettings] = None, batch_size: int = 16) -> str:
+        """Transcribe an audio file or 16kHz mono float32 samples with enhanced Hindi/Hinglish support
+        
+        When ass_path is given, a styled ASS script is also written from the same segments
+        so subtitle burning does not need to re-parse the SRT.
+        """
+        return self.transcribe_audio_with_language(
+            audio, progress_callback, language, task, auto_detect_language, ass_path, font_settings, batch_size
+        )[0]
+    
+    def transcribe_audio_with_language(self, audio: Union[str, np.ndarray], progress_callback: Optional[Callable] = None,
+                                       language: Optional[str] = None, task: str = "transcribe",
+                                       auto_detect_language: bool = True, ass_path: Optional[str] = None,
+                                       font_settings: Optional[FontSettings] = None,
+                                       batch_size: int = 16) -> Tuple[str, Optional[str]]:
+        """Like transcribe_audio_local, but also return the language code of the transcript
+        
+        Returns (srt_content, language); on failure (error message, None).
+        """
         try:
-            if not os.path.exists(audio_path):
-                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+            if isinstance(audio, str):
+                if not os.path.exists(audio):
+                    raise FileNotFoundError(f"Audio file not found: {audio}")
+                audio_source = audio
+            else:
+                audio_source = f"in-memory audio ({len(audio) / 16000:.1f}s)"
             
             if progress_callback:
                 progress_callback(f"🎤 Starting transcription with {self.model_name} model...")
             
-            # Auto-detect language if not specified and auto_detect is enabled
-            if auto_detect_language and not language:
-                detected_type = self.detect_language_type(audio_path, progress_callback)
-                language_config = self.LANGUAGE_CONFIGS[detected_type]
-                language = language_config['code']
-                logger.info(f"Using detected language: {language} for {detected_type}")
-            elif language:
+            # Identical audio, model and settings always give the same transcript
+            cache_key = _audio_fingerprint(audio)
+            transcript_key = self._transcript_cache_key(cache_key, language, task)
+            cached_result = self._load_cached_transcript(transcript_key)
+            
+            # Auto-detect language from the main transcription pass if not specified
+            detect_from_result = auto_detect_language and not language
+            cached_language = None
+            if detect_from_result and not cached_result:
+                # Reuse the language detected on an earlier run over the same audio; decode with the
+                # language that run decoded with, so both runs see the same decoder settings
+                cached = self._load_cached_language(cache_key)
+                if cached and cached.get('decode_language'):
+                    cached_language = cached
+                    detect_from_result = False
+                    language = cached['decode_language']
+                    logger.info(f"Using cached language: {language} for {cached['language_type']}")
+                    if progress_callback:
+                        progress_callback(f"🎤 Detected language: {self.LANGUAGE_CONFIGS[cached['language_type']]['name']} (cached)")
+            
+            if language:
                 # Map common language inputs
                 language_mapping = {
                     'hindi': 'hi',
@@ -262,47 +686,56 @@ class LocalWhisperTools:
             transcribe_options = {
                 "word_timestamps": True,
                 "task": task,
-                "verbose": False,
-                "condition_on_previous_text": True,  # Better context for mixed languages
-                "temperature": 0.0,  # More deterministic for better accuracy
+                "batch_size": batch_size,  # VAD chunks decoded together by the batched pipeline
+                "vad_filter": True,
+                # The batched pipeline decodes once, at temperature[0] only; weak Hindi segments
+                # are re-decoded afterwards by _redecode_low_confidence
+                "temperature": 0.0,
                 "compression_ratio_threshold": 2.4,  # Detect repetitive transcriptions
-                "logprob_threshold": -1.0,  # Filter low-confidence segments
+                "log_prob_threshold": -1.0,  # Filter low-confidence segments
                 "no_speech_threshold": 0.6  # Better silence detection
             }
             
             if language:
                 transcribe_options["language"] = language
                 logger.info(f"Transcribing in language: {language}")
+            elif detect_from_result:
+                # Let Whisper sample more audio when the first window is ambiguous
+                transcribe_options["language_detection_threshold"] = self.LANGUAGE_PROBABILITY_THRESHOLD
+                transcribe_options["language_detection_segments"] = 3
             
-            logger.info(f"Starting transcription of: {audio_path}")
+            logger.info(f"Starting transcription of: {audio_source}")
             start_time = time.time()
             
-            # Multiple pass transcription for better accuracy
-            if progress_callback:
-                progress_callback("🎤 Running primary transcription pass...")
-            
-            result = self.model.transcribe(audio_path, **transcribe_options)
-            
-            # If confidence is low, try with different parameters
-            avg_logprob = sum(segment.get('avg_logprob', -1.0) for segment in result.get('segments', [])) / max(len(result.get('segments', [])), 1)
-            
-            if avg_logprob < -0.8 and language == 'hi':  # Low confidence for Hindi
+            if cached_result:
                 if progress_callback:
-                    progress_callback("🔄 Low confidence detected, trying alternative approach...")
-                
-                # Try without language specification for mixed content
-                transcribe_options_alt = transcribe_options.copy()
-                transcribe_options_alt.pop('language', None)
-                transcribe_options_alt['temperature'] = 0.2  # Slightly more creative
-                
-                result_alt = self.model.transcribe(audio_path, **transcribe_options_alt)
+                    progress_callback("🎤 Reusing cached transcript for this audio...")
+                result = cached_result
+            else:
+                if progress_callback:
+                    progress_callback("🎤 Running transcription pass...")
                 
-                # Use alternative result if it has better confidence
-                avg_logprob_alt = sum(segment.get('avg_logprob', -1.0) for segment in result_alt.get('segments', [])) / max(len(result_alt.get('segments', [])), 1)
+                result = self._transcribe_batched(audio, transcribe_options, progress_callback)
+            
+            if detect_from_result:
+                # Reuse the language Whisper detected for the main pass instead of a separate detection run
+                detected_lang = result['language'] if result['language_probability'] >= self.LANGUAGE_PROBABILITY_THRESHOLD else None
+                text_sample = ''.join(segment['text'] for segment in result['segments'] if segment['start'] < 30).lower()
+                detected_type = self._classify_language_type(detected_lang, text_sample)
+                language = self.LANGUAGE_CONFIGS[detected_type]['code']
+                logger.info(f"Using detected language: {language} for {detected_type}")
+                self._store_cached_language(cache_key, detected_type, result['language'])
                 
-                if avg_logprob_alt > avg_logprob:
-                    result = result_alt
-                    logger.info("Using alternative transcription with better confidence")
+                if progress_callback:
+                    progress_callback(f"🎤 Detected language: {self.LANGUAGE_CONFIGS[detected_type]['name']}")
+            elif cached_language:
+                # Post-process with the same language type the original run classified
+                language = cached_language['language']
+            
+            if not cached_result:
+                if language == 'hi':
+                    result = self._redecode_low_confidence(audio, result, task, progress_callback)
+                self._store_cached_transcript(transcript_key, result)
             
             end_time = time.time()
             duration = end_time - start_time
@@ -319,18 +752,167 @@ class LocalWhisperTools:
             # Post-process for Hindi/Hinglish specific improvements
             processed_result = self._post_process_hindi_hinglish(result, language)
             
-            srt_content = self._convert_to_srt(processed_result)
-            
-            if not srt_content.strip():
+            srt_buffer = io.StringIO()
+            if not self._convert_to_srt(processed_result, srt_buffer):
                 raise ValueError("Generated SRT content is empty")
+            srt_content = srt_buffer.getvalue()
+            
+            if ass_path:
+                with open(ass_path, 'w', encoding='utf-8') as f:
+                    self._convert_to_ass(processed_result, font_settings or FontSettings(), f)
             
             logger.info(f"Generated SRT with {len(processed_result['segments'])} segments")
-            return srt_content
+            return srt_content, language or result.get('language')
         
         except Exception as e:
             error_msg = f"Error transcribing audio: {str(e)}"
             logger.error(error_msg)
-            return error_msg
+            return error_msg, None
+    
+    def transcribe_batch(self, audio_inputs: List[Union[str, np.ndarray]], progress_callback: Optional[Callable] = None,
+                         language: Optional[str] = None, task: str = "transcribe",
+                         auto_detect_language: bool = True, batch_size: int = 16) -> List[str]:
+        """Transcribe several audio files or sample arrays with the one loaded model
+        
+        Returns one SRT string (or error message) per input, in order.
+        """
+        srt_contents = []
+        
+        for index, audio in enumerate(audio_inputs, 1):
+            if progress_callback:
+                progress_callback(f"🎤 Transcribing file {index}/{len(audio_inputs)}...")
+            
+            srt_contents.append(self.transcribe_audio_local(
+                audio, progress_callback, language, task,
+                auto_detect_language=auto_detect_language, batch_size=batch_size
+            ))
+        
+        return srt_contents
+    
+    def _transcribe_batched(self, audio: Union[str, np.ndarray], transcribe_options: Dict[str, Any],
+                            progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """Run the batched pipeline, halving the batch size if the GPU runs out of memory"""
+        options = dict(transcribe_options)
+        
+        while True:
+            try:
+                # Segments are decoded lazily, so OOM surfaces while collecting them
+                segments, info = self.model.transcribe(audio, **options)
+                return self._segments_to_result(segments, info, progress_callback)
+            except RuntimeError as e:
+                batch_size = options.get("batch_size", 1)
+                if "out of memory" not in str(e).lower() or batch_size <= 1:
+                    raise
+                
+                options["batch_size"] = batch_size // 2
+                logger.warning(f"GPU out of memory at batch size {batch_size}, retrying with {options['batch_size']}")
+                if progress_callback:
+                    progress_callback(f"⚠️ GPU memory exhausted, retrying with batch size {options['batch_size']}...")
+    
+    def _redecode_low_confidence(self, audio: Union[str, np.ndarray], result: Dict[str, Any], task: str,
+                                 progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """Re-decode the weakest segments of a low-confidence transcript and keep whichever is better
+        
+        The batched pipeline has no temperature fallback, so when the transcript's average
+        log-probability is below LOW_CONFIDENCE_LOGPROB, up to MAX_REDECODE_SEGMENTS of its
+        weakest segments get one more pass without a forced language and with the sampling
+        fallback schedule. All windows go through a single sequential call, so the audio is
+        decoded and its features computed once.
+        """
+        segments = result['segments']
+        if not segments:
+            return result
+        avg_logprob = sum(segment.get('avg_logprob', -1.0) for segment in segments) / len(segments)
+        if avg_logprob >= self.LOW_CONFIDENCE_LOGPROB:
+            return result
+        
+        weak = sorted(
+            (index for index, segment in enumerate(segments)
+             if segment.get('avg_logprob', -1.0) < self.LOW_CONFIDENCE_LOGPROB),
+            key=lambda index: segments[index].get('avg_logprob', -1.0)
+        )[:self.MAX_REDECODE_SEGMENTS]
+        weak.sort()  # clip_timestamps must be in time order
+        if not weak:
+            return result
+        
+        logger.warning(f"Low average confidence for Hindi transcription: {avg_logprob:.2f}")
+        if progress_callback:
+            progress_callback(f"🔄 Low confidence detected, re-decoding {len(weak)} segment(s)...")
+        
+        clip_timestamps = []
+        for index in weak:
+            clip_timestamps += [segments[index]['start'], segments[index]['end']]
+        
+        try:
+            retry_segments, info = self.whisper_model.transcribe(
+                audio,
+                task=task,
+                word_timestamps=True,
+                condition_on_previous_text=False,
+                temperature=(0.2, 0.4, 0.6, 0.8, 1.0),
+                clip_timestamps=clip_timestamps
+            )
+            retried = self._segments_to_result(retry_segments, info)['segments']
+        except Exception as e:
+            logger.warning(f"Re-decode of low-confidence segments failed: {e}")
+            return result
+        
+        # Returned timestamps are absolute, so each new segment belongs to the window holding its midpoint
+        window_starts = [segments[index]['start'] for index in weak]
+        by_window = {index: [] for index in weak}
+        for segment in retried:
+            position = bisect.bisect_right(window_starts, (segment['start'] + segment['end']) / 2) - 1
+            if position >= 0:
+                by_window[weak[position]].append(segment)
+        
+        merged = []
+        replaced = 0
+        for index, segment in enumerate(segments):
+            retry = by_window.get(index)
+            if retry and sum(item['avg_logprob'] for item in retry) / len(retry) > segment.get('avg_logprob', -1.0):
+                merged.extend(retry)
+                replaced += 1
+            else:
+                merged.append(segment)
+        
+        if not replaced:
+            return result
+        
+        logger.info(f"Replaced {replaced} low-confidence segment(s) with re-decoded text")
+        return dict(result, segments=merged, text=''.join(segment['text'] for segment in merged))
+    
+    def _segments_to_result(self, segments, info, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """Collect faster-whisper segments into the dict layout used by the post-processing steps
+        
+        Segments are decoded as they are iterated, so their end times against the audio
+        duration give real transcription progress.
+        """
+        result_segments = []
+        last_reported = -1
+        for segment in segments:
+            if progress_callback and info.duration:
+                percent = min(int(segment.end / info.duration * 100), 100)
+                if percent >= last_reported + 5:
+                    last_reported = percent
+                    progress_callback(f"🎤 Transcribing: {percent}%")
+            
+            result_segments.append({
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'avg_logprob': segment.avg_logprob,
+                'words': [
+                    {'start': word.start, 'end': word.end, 'word': word.word, 'probability': word.probability}
+                    for word in (segment.words or [])
+                ]
+            })
+        
+        return {
+            'segments': result_segments,
+            'text': ''.join(segment['text'] for segment in result_segments),
+            'language': info.language,
+            'language_probability': info.language_probability
+        }
     
     def _post_process_hindi_hinglish(self, result: Dict[str, Any], language: Optional[str] = None) -> Dict[str, Any]:
         """Post-process transcription result for Hindi/Hinglish specific improvements"""
@@ -363,45 +945,19 @@ class LocalWhisperTools:
     
     def _fix_hindi_hinglish_errors(self, text: str) -> str:
         """Fix common transcription errors in Hindi/Hinglish text"""
-        # Common corrections for Hindi/Hinglish
-        corrections = {
-            # English words commonly mistranscribed
-            'और': 'aur',  # Keep 'and' in romanized form for Hinglish
-            'है ना': 'hai na',
-            'क्या': 'kya',
-            'कैसे': 'kaise',
-            'अच्छा': 'accha',
-            'बहुत': 'bahut',
-            'थोड़ा': 'thoda',
-            
-            # Common misheard words
-            'theek': 'thik',
-            'paani': 'pani',
-            'ghar': 'ghar',
-            'kaun': 'kaun',
-            'kyun': 'kyun',
-            
-            # Fix spacing issues
-            'hai na': 'hai na',
-            'kar na': 'karna',
-            'ja na': 'jana',
-            'aa na': 'aana',
-        }
-        
-        # Apply corrections
-        for wrong, correct in corrections.items():
-            text = text.replace(wrong, correct)
+        # Apply corrections in a single pass
+        text = _CORR_RE.sub(lambda m: _CORRECTIONS[m.group(0)], text)
         
         # Clean up extra spaces and punctuation
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'([.!?])\s*([.!?])+', r'\1', text)  # Remove repeated punctuation
+        text = _WS.sub(' ', text)
+        text = _REPEAT_PUNCT.sub(r'\1', text)  # Remove repeated punctuation
         
         # Ensure proper capitalization for mixed content
-        sentences = re.split(r'([.!?]\s*)', text)
+        sentences = _SENT_SPLIT.split(text)
         processed_sentences = []
         
         for sentence in sentences:
-            if sentence.strip() and not re.match(r'[.!?]\s*', sentence):
+            if sentence.strip() and not _SENT_END.match(sentence):
                 # Capitalize first letter of each sentence
                 sentence = sentence.strip()
                 if sentence:
@@ -410,19 +966,9 @@ class LocalWhisperTools:
         
         return ''.join(processed_sentences).strip()
     
-    def _convert_to_srt(self, result: Dict[str, Any]) -> str:
-        """Convert Whisper result to SRT format with improved Hindi/Hinglish text processing"""
-        srt_lines = []
-        
-        if 'segments' not in result:
-            logger.warning("No segments found in transcription result")
-            return ""
-        
-        segment_counter = 1
-        
+    def _iter_subtitles(self, result: Dict[str, Any]):
+        """Yield cleaned (start, end, text) tuples for the segments worth showing as subtitles"""
         for segment in result['segments']:
-            start_time = self._format_timestamp(segment.get('start', 0))
-            end_time = self._format_timestamp(segment.get('end', 0))
             text = segment.get('text', '').strip()
             
             # Skip empty segments
@@ -433,80 +979,477 @@ class LocalWhisperTools:
             text = self._clean_subtitle_text(text)
             
             # Skip very short segments (likely noise) but be more lenient for Hindi
-            if len(text) < 1 or (len(text) < 3 and not re.search(r'[\u0900-\u097F]', text)):
+            if len(text) < 1 or (len(text) < 3 and not _DEVANAGARI.search(text)):
                 continue
             
             # Skip segments that are just punctuation or numbers
-            if re.match(r'^[\s\d\W]+$', text) and not re.search(r'[\u0900-\u097F\w]', text):
+            if _ONLY_NONWORD.match(text) and not _DEVANAGARI_OR_WORD.search(text):
                 continue
             
-            srt_lines.append(str(segment_counter))
-            srt_lines.append(f"{start_time} --> {end_time}")
-            srt_lines.append(text)
-            srt_lines.append("")
-            
+            yield segment.get('start', 0), segment.get('end', 0), text
+    
+    def _convert_to_srt(self, result: Dict[str, Any], out: TextIO) -> int:
+        """Write Whisper result to out in SRT format with improved Hindi/Hinglish text processing
+        
+        Returns the number of subtitles written.
+        """
+        if 'segments' not in result:
+            logger.warning("No segments found in transcription result")
+            return 0
+        
+        segment_counter = 0
+        
+        # Whisper timestamps are non-negative floats, so skip the validating formatter here
+        fmt_ts = _fmt_ts
+        write = out.write
+        
+        for start, end, text in self._iter_subtitles(result):
             segment_counter += 1
+            write(f"{segment_counter}\n{fmt_ts(start)} --> {fmt_ts(end)}\n{text}\n\n")
+        
+        return segment_counter
+    
+    def _convert_to_ass(self, result: Dict[str, Any], font_settings: FontSettings, out: TextIO) -> int:
+        """Write Whisper result to out as a styled ASS script, without an SRT round-trip
+        
+        Returns the number of dialogue events written.
+        """
+        if 'segments' not in result:
+            logger.warning("No segments found in transcription result")
+            return 0
+        
+        out.write(font_settings.to_ass_header())
+        
+        event_counter = 0
+        
+        for start, end, text in self._iter_subtitles(result):
+            event_counter += 1
+            start_time = self._format_ass_timestamp(start)
+            end_time = self._format_ass_timestamp(end)
+            text = text.replace('\n', '\\N')
+            out.write(f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{text}\n")
         
-        return "\n".join(srt_lines)
+        return event_counter
     
     def _clean_subtitle_text(self, text: str) -> str:
         """Clean subtitle text for better readability in Hindi/Hinglish"""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS.sub(' ', text)
         
         # Fix common formatting issues
-        text = re.sub(r'\s*([,.!?])\s*', r'\1 ', text)  # Fix punctuation spacing
-        text = re.sub(r'\s+([,.!?])', r'\1', text)  # Remove space before punctuation
+        text = _PUNCT_SPACE.sub(r'\1 ', text)  # Fix punctuation spacing
+        text = _SPACE_BEFORE_PUNCT.sub(r'\1', text)  # Remove space before punctuation
         
         # Remove leading/trailing whitespace and punctuation artifacts
         text = text.strip(' .,!?')
         
         # Ensure text doesn't start with lowercase after punctuation
-        text = re.sub(r'([.!?]\s+)([a-z])', lambda m: m.group(1) + m.group(2).upper(), text)
+        text = _SENT_CAP.sub(lambda m: m.group(1) + m.group(2).upper(), text)
         
         return text
     
     def _format_timestamp(self, seconds: float) -> str:
         """Format timestamp for SRT format with validation"""
-        if not isinstance(seconds, (int, float)) or seconds < 0:
-            logger.warning(f"Invalid timestamp: {seconds}, using 0")
-            seconds = 0
-        
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millisecs = int((seconds % 1) * 1000)
-        
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
+        return _fmt_ts_safe(seconds)
+    
+    def _format_ass_timestamp(self, seconds: float) -> str:
+        """Format timestamp for ASS events (centisecond precision)"""
+        srt_timestamp = _fmt_ts(seconds)
+        return f"{srt_timestamp[:8]}.{srt_timestamp[9:11]}"
 
 class VideoProcessor:
     """Enhanced video processing class with robust subtitle burning and improved error handling"""
     
-    def __init__(self):
+    # Hardware H.264 encoders in priority order
+    HW_ENCODERS = ['h264_nvenc', 'h264_qsv', 'h264_videotoolbox', 'h264_amf', 'h264_vaapi']
+    
+    # Encoder-specific rate/speed options for subtitle burning
+    ENCODER_OPTIONS = {
+        # Preset, -tune and -x264-params are assembled in _encoder_options
+        'libx264': [],
+        'h264_nvenc': ['-preset', 'p4', '-tune', 'hq'],
+        'h264_qsv': ['-preset', 'fast'],
+        'h264_amf': ['-quality', 'speed'],
+        'h264_vaapi': [],
+        'h264_videotoolbox': []
+    }
+    
+    # Hardware decode to pair with an encoder; frames are downloaded for the CPU subtitle filter
+    HWACCEL_INPUT_ARGS = {
+        'h264_nvenc': ['-hwaccel', 'cuda']
+    }
+    
+    VAAPI_DEVICE = '/dev/dri/renderD128'
+    
+    # Minimum video length (seconds) before subtitle burning is split across parallel workers
+    PARALLEL_BURN_MIN_DURATION = 120
+    
+    # Audio codecs each output container can carry as-is; other sources are re-encoded to AAC.
+    # Containers not listed (e.g. MKV) take any codec.
+    CONTAINER_AUDIO_CODECS = {
+        '.mp4': {'aac', 'mp3', 'ac3', 'eac3', 'alac', 'flac', 'opus'},
+        '.m4v': {'aac', 'mp3', 'ac3', 'eac3', 'alac', 'flac', 'opus'},
+        '.mov': {'aac', 'mp3', 'ac3', 'eac3', 'alac', 'pcm_s16le', 'pcm_s24le'}
+    }
+    
+    # ISO 639-1 codes Whisper reports -> ISO 639-2 codes that MP4 and MKV track tags require
+    ISO639_2_CODES = {
+        'hi': 'hin', 'en': 'eng', 'ur': 'urd', 'bn': 'ben', 'pa': 'pan', 'mr': 'mar',
+        'gu': 'guj', 'ta': 'tam', 'te': 'tel', 'kn': 'kan', 'ml': 'mal', 'ne': 'nep',
+        'es': 'spa', 'fr': 'fre', 'de': 'ger', 'it': 'ita', 'pt': 'por', 'ru': 'rus',
+        'ar': 'ara', 'zh': 'chi', 'ja': 'jpn', 'ko': 'kor'
+    }
+    
+    # Video codecs that can be stream-copied into MP4 for soft subtitles
+    MP4_VIDEO_CODECS = {'h264', 'hevc', 'mpeg4', 'av1'}
+    
+    # Clips shorter than this (seconds) use sliced threads, which keep all cores busy on short encodes
+    SHORT_CLIP_MAX_DURATION = 300
+    
+    # x264 presets accepted for burn_preset
+    X264_PRESETS = ('ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow')
+    
+    def __init__(self, burn_preset: Optional[str] = None):
+        self.burn_preset = burn_preset or os.environ.get('BURN_PRESET', 'veryfast')
+        if self.burn_preset not in self.X264_PRESETS:
+            logger.warning(f"Unknown x264 preset '{self.burn_preset}', using veryfast")
+            self.burn_preset = 'veryfast'
         self.moviepy_available = MOVIEPY_AVAILABLE
         self.opencv_available = OPENCV_AVAILABLE
         self.ffmpeg_available = self._check_ffmpeg()
+        # Hardware encoder probing runs test encodes, so it is deferred until a burn needs it
+        self._hw_encoder: Optional[str] = None
+        self._hw_encoder_checked = False
+        self._duration_cache: Dict[Tuple[str, float], float] = {}
         
         # Log available tools
         logger.info(f"VideoProcessor initialized - FFmpeg: {self.ffmpeg_available}, "
                    f"MoviePy: {self.moviepy_available}, OpenCV: {self.opencv_available}")
     
-    def _check_ffmpeg(self) -> bool:
-        """Check if FFmpeg is available and get version info"""
+    @property
+    def hw_encoder(self) -> Optional[str]:
+        """Hardware H.264 encoder to burn with (None = libx264), detected on first use"""
+        if not self._hw_encoder_checked:
+            self._hw_encoder = self._detect_hw_encoder() if self.ffmpeg_available else None
+            self._hw_encoder_checked = True
+        return self._hw_encoder
+    
+    @hw_encoder.setter
+    def hw_encoder(self, encoder: Optional[str]):
+        self._hw_encoder = encoder
+        self._hw_encoder_checked = True
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _check_ffmpeg() -> bool:
+        """Check if FFmpeg is available; the PATH lookup is done once per process"""
+        ffmpeg_path = shutil.which('ffmpeg')
+        if ffmpeg_path:
+            logger.info(f"FFmpeg detected: {ffmpeg_path}")
+        else:
+            logger.warning("FFmpeg not available: not found on PATH")
+        return ffmpeg_path is not None
+    
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _detect_hw_encoder(cls) -> Optional[str]:
+        """Find the first hardware H.264 encoder that FFmpeg lists and can actually open (once per process)"""
+        try:
+            result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                  capture_output=True, text=True, timeout=10)
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.warning(f"FFmpeg encoder listing failed: {e}")
+            return None
+        
+        listed = [encoder for encoder in cls.HW_ENCODERS if encoder in result.stdout]
+        if not listed:
+            return None
+        
+        # Builds often list encoders whose hardware or driver is missing, so try a tiny encode
+        def probe(encoder: str) -> bool:
+            cmd = cls._ffmpeg_base_cmd(encoder) + [
+                '-f', 'lavfi', '-i', 'color=s=256x256:d=0.1',
+                '-vf', cls._hw_video_filter(encoder, 'null'),
+                '-c:v', encoder, '-f', 'null', '-'
+            ]
+            try:
+                return subprocess.run(cmd, capture_output=True, text=True, timeout=10).returncode == 0
+            except subprocess.TimeoutExpired:
+                return False
+        
+        # Trial encodes run concurrently, so detection costs the slowest probe rather than their sum
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(listed)) as executor:
+            futures = {encoder: executor.submit(probe, encoder) for encoder in listed}
+            # Keep HW_ENCODERS priority order when several work
+            for encoder in listed:
+                if futures[encoder].result():
+                    logger.info(f"Hardware encoder detected: {encoder}")
+                    return encoder
+        
+        return None
+    
+    @classmethod
+    def _ffmpeg_base_cmd(cls, encoder: str) -> list:
+        """FFmpeg executable plus any global arguments the encoder needs before the inputs"""
+        if encoder == 'h264_vaapi':
+            return ['ffmpeg', '-vaapi_device', cls.VAAPI_DEVICE]
+        return ['ffmpeg']
+    
+    @staticmethod
+    def _shifted_filter(video_filter: str, start: float) -> str:
+        """Wrap video_filter for input seeked to start seconds
+        
+        Input seeking resets timestamps to zero; shift them back so subtitle timing lines up,
+        then reset them again for the output.
+        """
+        return f'setpts=PTS+{start:.3f}/TB,{video_filter},setpts=PTS-STARTPTS'
+    
+    @staticmethod
+    def _hw_video_filter(encoder: str, video_filter: str) -> str:
+        """Append the upload step VAAPI needs after the CPU-side subtitle filter"""
+        if encoder == 'h264_vaapi':
+            return f'{video_filter},format=nv12,hwupload'
+        return video_filter
+    
+    @staticmethod
+    def _probe_codec(input_path: str, stream: str) -> Optional[str]:
+        """Codec name of the first stream matching stream (e.g. 'a:0', 'v:0'), or None"""
         try:
-            result = subprocess.run(['ffmpeg', '-version'],
-                                  capture_output=True, check=True, text=True, timeout=10)
+            result = subprocess.run([
+                'ffprobe', '-v', 'error', '-select_streams', stream,
+                '-show_entries', 'stream=codec_name',
+                '-of', 'default=noprint_wrappers=1:nokey=1',
+                input_path
+            ], capture_output=True, text=True, timeout=30)
+            return result.stdout.strip() or None
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.warning(f"Could not probe {stream} codec of {input_path}: {e}")
+            return None
+    
+    def _soft_subtitle_container(self, video_path: str) -> str:
+        """Output extension for a stream-copied soft subtitle video: MP4 when it can hold the
+        source video codec, otherwise MKV (e.g. VP8/VP9 WebM sources)
+        """
+        codec = self._probe_codec(video_path, 'v:0')
+        return '.mp4' if codec in self.MP4_VIDEO_CODECS else '.mkv'
+    
+    def _compatible_audio_codec(self, input_path: str, out_container: str) -> list:
+        """Audio codec arguments: stream copy when out_container (e.g. '.mp4') can hold the
+        source codec, otherwise AAC at 128k
+        """
+        allowed = self.CONTAINER_AUDIO_CODECS.get(out_container.lower())
+        if allowed is None:
+            return ['-c:a', 'copy']
+        
+        codec = self._probe_codec(input_path, 'a:0')
+        
+        # No audio stream (or an unreadable probe): copying is a no-op either way
+        if not codec or codec in allowed:
+            return ['-c:a', 'copy']
+        
+        logger.info(f"Re-encoding {codec} audio to AAC for {out_container} output")
+        return ['-c:a', 'aac', '-b:a', '128k']
+    
+    @staticmethod
+    def _faststart_args(output_path: str) -> list:
+        """Move the MP4 index to the front so browsers can start playback before the download ends"""
+        if Path(output_path).suffix.lower() in ('.mp4', '.m4v', '.mov'):
+            return ['-movflags', '+faststart']
+        return []
+    
+    def _encoder_options(self, encoder: str, duration: Optional[float] = None) -> list:
+        """Output options for encoder, with the configured preset for libx264
+        
+        fastdecode and a short lookahead trim x264 work; clips known to be short also switch
+        from frame threading (whose lookahead serializes short encodes) to sliced threads.
+        """
+        if encoder != 'libx264':
+            return self.ENCODER_OPTIONS.get(encoder, [])
+        
+        tune, x264_params = 'fastdecode', 'rc-lookahead=10:ref=1'
+        threads = []
+        if duration is not None and duration < self.SHORT_CLIP_MAX_DURATION:
+            tune += ',zerolatency'
+            x264_params += ':sliced-threads=1:sync-lookahead=0'
+            threads = ['-threads', '0']
+        return ['-preset', self.burn_preset, '-tune', tune, '-x264-params', x264_params] + threads
+    
+    def _build_burn_cmd(self, video_path: str, video_filter: str, output_path: str,
+                        input_args: Optional[list] = None, output_args: Optional[list] = None,
+                        copy_audio: bool = True, duration: Optional[float] = None,
+                        faststart: bool = True, audio_source: Optional[str] = None,
+                        encoder: Optional[str] = None) -> list:
+        """Build the FFmpeg command that renders subtitles with video_filter and re-encodes the video
+        
+        duration, when known, lets the x264 threading mode be chosen for the clip length.
+        faststart=False skips the index relocation pass for intermediate files.
+        audio_source is the file whose audio codec is checked when video_path is not a media file.
+        encoder overrides the detected hardware encoder (or libx264).
+        """
+        encoder = encoder or self.hw_encoder or 'libx264'
+        return self._ffmpeg_base_cmd(encoder) + self.HWACCEL_INPUT_ARGS.get(encoder, []) + (input_args or []) + [
+            '-i', video_path,
+            '-vf', self._hw_video_filter(encoder, video_filter)
+        ] + (  # Copy audio without re-encoding when the output container allows it
+            self._compatible_audio_codec(audio_source or video_path, Path(output_path).suffix) if copy_audio else ['-an']
+        ) + [
+            '-c:v', encoder
+        ] + self._encoder_options(encoder, duration) + (output_args or []) + (
+            self._faststart_args(output_path) if faststart else []
+        ) + [
+            '-y',  # Overwrite output file
+            output_path
+        ]
+    
+    def _run_ffmpeg(self, cmd: list, duration: Optional[float] = None, progress_callback=None,
+                    progress_label: str = "", timeout: Optional[float] = None,
+                    cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+        """Run an FFmpeg command, reporting percentage progress from its -progress stream
+        
+        Only error-level logging is kept, spooled to a temp file, so long encodes neither
+        buffer their whole log in memory nor block on a full stderr pipe. Raises
+        subprocess.TimeoutExpired like subprocess.run when timeout elapses.
+        """
+        cmd = [cmd[0], '-progress', 'pipe:1', '-nostats', '-loglevel', 'error'] + cmd[1:]
+        
+        with tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='replace') as stderr_file:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file,
+                                       text=True, bufsize=1, cwd=cwd)
+            timed_out = threading.Event()
             
-            # Extract version info
-            version_line = result.stdout.split('\n')[0]
-            logger.info(f"FFmpeg detected: {version_line}")
-            return True
-        except subprocess.TimeoutExpired:
-            logger.warning("FFmpeg version check timed out")
-            return False
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            logger.warning(f"FFmpeg not available: {e}")
-            return False
+            def kill_on_timeout():
+                timed_out.set()
+                process.kill()
+            
+            timer = threading.Timer(timeout, kill_on_timeout) if timeout else None
+            if timer:
+                timer.start()
+            
+            try:
+                last_reported = -1
+                for line in process.stdout:
+                    # out_time_ms is reported in microseconds despite its name
+                    if not (duration and progress_callback and line.startswith('out_time_ms=')):
+                        continue
+                    try:
+                        out_time = int(line.split('=', 1)[1]) / 1_000_000
+                    except ValueError:  # "N/A" before the first frame
+                        continue
+                    
+                    percent = min(int(out_time / duration * 100), 100)
+                    if percent >= last_reported + 5:
+                        last_reported = percent
+                        progress_callback(f"{progress_label} {percent}%")
+                
+                returncode = process.wait()
+            finally:
+                if timer:
+                    timer.cancel()
+            
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            
+            stderr_file.seek(0)
+            return subprocess.CompletedProcess(cmd, returncode, None, stderr_file.read())
+    
+    def get_video_duration(self, video_path: str) -> Optional[float]:
+        """Return the container duration in seconds using ffprobe, cached per file and mtime"""
+        try:
+            key = (os.path.abspath(video_path), os.path.getmtime(video_path))
+        except OSError:
+            key = None
+        if key in self._duration_cache:
+            return self._duration_cache[key]
+        
+        duration = self._probe_duration(video_path)
+        if key is not None and duration is not None:
+            self._duration_cache[key] = duration
+        return duration
+    
+    def _probe_duration(self, video_path: str) -> Optional[float]:
+        """Run ffprobe for the container duration"""
+        try:
+            result = subprocess.run([
+                'ffprobe', '-v', 'error',
+                '-show_entries', 'format=duration',
+                '-of', 'default=noprint_wrappers=1:nokey=1',
+                video_path
+            ], capture_output=True, text=True, timeout=30)
+            return float(result.stdout.strip())
+        except (subprocess.TimeoutExpired, FileNotFoundError, ValueError) as e:
+            logger.warning(f"Could not probe duration of {video_path}: {e}")
+            return None
+    
+    def _parallel_burn_workers(self, duration: Optional[float]) -> int:
+        """Number of concurrent FFmpeg workers worth using to burn this video (1 = single pass)"""
+        # Hardware encoders have few sessions and are rarely the bottleneck; keep them single-pass
+        if self.hw_encoder:
+            return 1
+        
+        workers = (os.cpu_count() or 1) // 2
+        if workers < 2:
+            return 1
+        
+        if not duration or duration < self.PARALLEL_BURN_MIN_DURATION:
+            return 1
+        
+        return workers
+    
+    def _burn_in_segments(self, video_path: str, video_filter: str, output_path: str,
+                          duration: float, workers: int) -> subprocess.CompletedProcess:
+        """Burn subtitles into equal time slices concurrently, then join them with the concat demuxer
+        
+        The single-threaded subtitle filter limits one FFmpeg process to roughly one core, so each
+        slice gets its own process. Slices are encoded without audio; the original audio track is
+        stream-copied back in when the slices are concatenated.
+        """
+        chunk = duration / workers
+        threads = str(max((os.cpu_count() or 1) // workers, 1))
+        work_dir = tempfile.mkdtemp(prefix='burn_', dir=os.path.dirname(os.path.abspath(output_path)))
+        
+        try:
+            part_cmds = []
+            for i in range(workers):
+                start = i * chunk
+                seek_args = ['-ss', f'{start:.3f}']
+                if i < workers - 1:
+                    seek_args += ['-t', f'{chunk:.3f}']
+                
+                part_filter = self._shifted_filter(video_filter, start)
+                part_path = os.path.join(work_dir, f'part{i:03d}.mp4')
+                part_cmds.append((part_path, self._build_burn_cmd(
+                    video_path, part_filter, part_path,
+                    input_args=seek_args, output_args=['-threads', threads], copy_audio=False,
+                    faststart=False
+                )))
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda cmd: subprocess.run(cmd, capture_output=True, text=True, timeout=600),
+                    [cmd for _, cmd in part_cmds]
+                ))
+            
+            for result in results:
+                if result.returncode != 0:
+                    return result
+            
+            list_path = os.path.join(work_dir, 'parts.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for part_path, _ in part_cmds:
+                    escaped_path = part_path.replace("'", "'\\''")
+                    f.write(f"file '{escaped_path}'\n")
+            
+            concat_cmd = [
+                'ffmpeg', '-f', 'concat', '-safe', '0', '-i', list_path,
+                '-i', video_path,
+                '-map', '0:v', '-map', '1:a?',
+                '-c:v', 'copy'
+            ] + self._compatible_audio_codec(video_path, Path(output_path).suffix) + self._faststart_args(output_path) + [
+                '-y', output_path
+            ]
+            return subprocess.run(concat_cmd, capture_output=True, text=True, timeout=600)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
     
     def extract_audio(self, video_path: str, audio_path: str, progress_callback=None) -> bool:
         """Extract audio from video using available methods"""
@@ -523,11 +1466,14 @@ class VideoProcessor:
                     '-acodec', 'pcm_s16le',
                     '-ar', '16000',  # 16kHz sample rate
                     '-ac', '1',      # Mono
+                    '-f', 'wav',
                     '-y',            # Overwrite output
                     audio_path
                 ]
                 
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                result = self._run_ffmpeg(
+                    cmd, self.get_video_duration(video_path), progress_callback, "🎵 Extracting audio:"
+                )
                 if result.returncode == 0:
                     return True
                 else:
@@ -544,8 +1490,13 @@ class VideoProcessor:
                     progress_callback("🎵 Extracting audio with MoviePy...")
                 
                 video_clip = VideoFileClip(video_path)
+                # Match Whisper's input format so it doesn't resample again
                 video_clip.audio.write_audiofile(
                     audio_path,
+                    fps=16000,
+                    nbytes=2,
+                    codec='pcm_s16le',
+                    ffmpeg_params=['-ac', '1'],
                     verbose=False,
                     logger=None,
                     temp_audiofile=None,
@@ -559,6 +1510,92 @@ class VideoProcessor:
         
         return False
 
+    def extract_audio_to_array(self, video_path: str, progress_callback=None) -> Optional[np.ndarray]:
+        """Decode audio straight into 16kHz mono float32 samples through an FFmpeg pipe"""
+        return self._decode_audio_pcm(video_path, progress_callback)
+    
+    def extract_audio_from_stream(self, video_stream: io.BufferedIOBase, progress_callback=None) -> Optional[np.ndarray]:
+        """Decode audio from a readable binary stream fed to FFmpeg on stdin
+        
+        A stream backed by a regular file is opened as /dev/stdin, which FFmpeg can seek, so
+        MP4s with the moov atom at the end still demux; anything else is piped (pipe:0).
+        """
+        input_arg = 'pipe:0'
+        try:
+            if stat.S_ISREG(os.fstat(video_stream.fileno()).st_mode) and os.path.exists('/dev/stdin'):
+                input_arg = '/dev/stdin'
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            pass
+        return self._decode_audio_pcm(input_arg, progress_callback, video_stream)
+    
+    def _decode_audio_pcm(self, input_arg: str, progress_callback=None,
+                          video_stream: Optional[io.BufferedIOBase] = None) -> Optional[np.ndarray]:
+        """Run FFmpeg on input_arg (a path, or /dev/stdin or pipe:0 with video_stream) and return float32 samples"""
+        if not self.ffmpeg_available:
+            return None
+        
+        try:
+            if progress_callback:
+                progress_callback("🎵 Extracting audio with FFmpeg...")
+            
+            cmd = [
+                'ffmpeg', '-i', input_arg,
+                '-vn',  # No video
+                '-f', 's16le',
+                '-acodec', 'pcm_s16le',
+                '-ar', '16000',  # 16kHz sample rate
+                '-ac', '1',      # Mono
+                '-'              # Write raw samples to stdout
+            ]
+            
+            # 16kHz mono s16le is 32000 bytes per second, so bytes read give the progress
+            duration = self.get_video_duration(input_arg) if video_stream is None else None
+            expected_bytes = duration * 32000 if duration else None
+            
+            stdin, input_bytes = None, None
+            if video_stream is not None:
+                # Hand FFmpeg the file descriptor when there is one; in-memory uploads are written to a pipe
+                try:
+                    video_stream.fileno()
+                    stdin = video_stream
+                except (AttributeError, OSError, io.UnsupportedOperation):
+                    stdin, input_bytes = subprocess.PIPE, video_stream.read()
+            
+            with tempfile.TemporaryFile() as stderr_file:
+                process = subprocess.Popen(cmd, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr_file)
+                
+                if input_bytes is not None:
+                    def feed_input():
+                        try:
+                            process.stdin.write(input_bytes)
+                        except BrokenPipeError:
+                            pass
+                        finally:
+                            process.stdin.close()
+                    threading.Thread(target=feed_input, daemon=True).start()
+                
+                pcm = bytearray()
+                last_reported = -1
+                for chunk in iter(lambda: process.stdout.read(1 << 20), b''):
+                    pcm += chunk
+                    if expected_bytes and progress_callback:
+                        percent = min(int(len(pcm) / expected_bytes * 100), 100)
+                        if percent >= last_reported + 5:
+                            last_reported = percent
+                            progress_callback(f"🎵 Extracting audio: {percent}%")
+                
+                if process.wait() != 0 or not pcm:
+                    stderr_file.seek(0)
+                    if progress_callback:
+                        progress_callback(f"⚠️ FFmpeg failed: {stderr_file.read().decode('utf-8', errors='replace')[-500:]}")
+                    return None
+            
+            return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"⚠️ FFmpeg error: {e}")
+            return None
+
     def validate_srt_file(self, srt_path: str) -> Tuple[bool, str]:
         """Validate SRT file format and content"""
         try:
@@ -595,61 +1632,58 @@ class VideoProcessor:
         except Exception as e:
             return False, f"Error validating SRT file: {e}"
 
-    def normalize_path(self, path: str) -> str:
-        """Normalize path for FFmpeg (especially for Windows)"""
-        # Convert to forward slashes and escape special characters
-        normalized = path.replace('\\', '/')
-        # Escape special characters for FFmpeg
-        normalized = normalized.replace(':', '\\:')
-        return normalized
+    @staticmethod
+    def _escape_ffmpeg_filter_path(path: str) -> str:
+        """Quote a file path for use as a filter option value, e.g. subtitles=filename=<result>
+        
+        Inside the quotes only ':' (the option separator) needs a backslash; a literal quote
+        has to close the quoted run, be escaped, and reopen it. Windows separators become '/'.
+        """
+        escaped = path.replace('\\', '/').replace(':', '\\:')
+        escaped = escaped.replace("'", r"'\\\''")
+        return f"'{escaped}'"
 
     def create_styled_ass_file(self, srt_path: str, ass_path: str, font_settings: FontSettings) -> bool:
         """Create ASS file with custom styling from SRT file"""
         try:
-            # Read SRT content
-            with open(srt_path, 'r', encoding='utf-8') as f:
-                srt_content = f.read()
-            
-            # Parse SRT to extract subtitle data
-            subtitles = []
-            blocks = srt_content.strip().split('\n\n')
-            
-            for block in blocks:
-                lines = block.strip().split('\n')
-                if len(lines) >= 3:
-                    try:
-                        id_num = int(lines[0])
-                        time_match = re.match(r'(\d{2}:\d{2}:\d{2}),(\d{3}) --> (\d{2}:\d{2}:\d{2}),(\d{3})', lines[1])
+            # Stream SRT blocks straight into ASS events, one line at a time
+            with open(srt_path, 'r', encoding='utf-8') as src, open(ass_path, 'w', encoding='utf-8') as dst:
+                dst.write(font_settings.to_ass_header())
+                
+                state = _SRT_WAIT_INDEX
+                start_time = end_time = None
+                text_lines = []
+                
+                for line in src:
+                    line = line.strip()
+                    
+                    # A blank line ends the current block
+                    if not line:
+                        if state == _SRT_WAIT_TEXT and text_lines:
+                            # Clean text for ASS format
+                            text = '\\N'.join(text_lines)
+                            dst.write(f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{text}\n")
+                        state = _SRT_WAIT_INDEX
+                        text_lines = []
+                        continue
+                    
+                    if state == _SRT_WAIT_INDEX:
+                        state = _SRT_WAIT_TIME if line.isdigit() else _SRT_SKIP_BLOCK
+                    elif state == _SRT_WAIT_TIME:
+                        time_match = _SRT_TIME.match(line)
                         if time_match:
                             start_time = f"{time_match.group(1)}.{time_match.group(2)[:2]}"
                             end_time = f"{time_match.group(3)}.{time_match.group(4)[:2]}"
-                            text = '\n'.join(lines[2:])
-                            subtitles.append((start_time, end_time, text))
-                    except (ValueError, AttributeError):
-                        continue
-            
-            # Create ASS content with advanced styling
-            ass_content = f"""[Script Info]
-Title: Generated Subtitles
-ScriptType: v4.00+
-
-[V4+ Styles]
-Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-Style: Default,{font_settings.family},{font_settings.size},{font_settings._color_to_ass(font_settings.color)},&H000000ff,{font_settings._color_to_ass(font_settings.outline_color)},&H80000000,{1 if font_settings.bold else 0},{1 if font_settings.italic else 0},0,0,100,100,0,0,1,2,{2 if font_settings.shadow else 0},2,10,10,10,1
-
-[Events]
-Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-"""
-            
-            # Add subtitle events
-            for start_time, end_time, text in subtitles:
-                # Clean text for ASS format
-                text = text.replace('\n', '\\N')
-                ass_content += f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-            
-            # Write ASS file
-            with open(ass_path, 'w', encoding='utf-8') as f:
-                f.write(ass_content)
+                            state = _SRT_WAIT_TEXT
+                        else:
+                            state = _SRT_SKIP_BLOCK
+                    elif state == _SRT_WAIT_TEXT:
+                        text_lines.append(line)
+                
+                # Flush the last block when the file has no trailing blank line
+                if state == _SRT_WAIT_TEXT and text_lines:
+                    text = '\\N'.join(text_lines)
+                    dst.write(f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{text}\n")
             
             logger.info(f"Created ASS file with styling: {ass_path}")
             return True
@@ -658,8 +1692,100 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             logger.error(f"Error creating ASS file: {e}")
             return False
 
-    def burn_subtitles_to_video(self, video_path: str, srt_path: str, output_path: str, font_settings=None, progress_callback=None) -> bool:
-        """Fixed subtitle burning with proper error handling"""
+    def mux_soft_subtitles(self, video_path: str, srt_path: str, output_path: str, language: Optional[str] = None,
+                           progress_callback=None) -> bool:
+        """Add the SRT as a selectable subtitle track, stream-copying audio and video"""
+        try:
+            if progress_callback:
+                progress_callback("📝 Muxing soft subtitles without re-encoding...")
+            
+            # MP4 only carries timed text; other containers (MKV) take SRT as-is
+            subtitle_codec = 'mov_text' if Path(output_path).suffix.lower() in ('.mp4', '.m4v', '.mov') else 'srt'
+            
+            cmd = [
+                'ffmpeg', '-i', video_path,
+                '-i', srt_path,
+                '-c:v', 'copy'  # Copy video (and audio where the container allows) without re-encoding
+            ] + self._compatible_audio_codec(video_path, Path(output_path).suffix) + [
+                '-c:s', subtitle_codec
+            ]
+            # Track tags need three-letter codes; MP4 silently drops anything else
+            language_tag = self.ISO639_2_CODES.get(language, language) if language else None
+            if language_tag and len(language_tag) == 3:
+                cmd += ['-metadata:s:s:0', f'language={language_tag}']
+            cmd += self._faststart_args(output_path) + ['-y', output_path]
+            
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+            
+            if result.returncode == 0:
+                if progress_callback:
+                    progress_callback("✅ Soft subtitles muxed successfully!")
+                return True
+            
+            if progress_callback:
+                progress_callback(f"⚠️ Soft subtitle mux failed: {result.stderr[:200]}")
+            return False
+        except subprocess.TimeoutExpired:
+            if progress_callback:
+                progress_callback("⚠️ Soft subtitle mux timed out")
+            return False
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"⚠️ Soft subtitle mux error: {e}")
+            return False
+
+    def _subtitle_filter(self, filter_name: str, path: str, force_style: Optional[str] = None) -> str:
+        """Video filter that renders the subtitle file at path with the ass or subtitles filter
+        
+        force_style (subtitles filter only) overrides the style of SRT input, e.g. with
+        FontSettings.to_ffmpeg_style().
+        """
+        video_filter = f"{filter_name}=filename={self._escape_ffmpeg_filter_path(path)}"
+        if force_style:
+            video_filter += f":force_style={self._escape_ffmpeg_filter_path(force_style)}"
+        return video_filter
+    
+    def _probe_subtitle_filter(self, srt_path: str, ass_path: Optional[str] = None) -> Optional[str]:
+        """Find which subtitle filter works here: 'ass', 'subtitles' or None
+        
+        Each candidate renders onto a tiny lavfi clip, in parallel, so a bad path or a
+        missing libass fails in well under a second instead of after a full encode.
+        """
+        candidates = {'subtitles': self._subtitle_filter('subtitles', srt_path)}
+        if ass_path:
+            candidates['ass'] = self._subtitle_filter('ass', ass_path)
+        
+        def probe(video_filter: str) -> bool:
+            try:
+                result = subprocess.run([
+                    'ffmpeg', '-v', 'error', '-f', 'lavfi', '-i', 'color=s=16x16:d=0.1',
+                    '-vf', video_filter, '-f', 'null', '-'
+                ], capture_output=True, text=True, timeout=10)
+                return result.returncode == 0
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                return False
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+            futures = {name: executor.submit(probe, vf) for name, vf in candidates.items()}
+            # Prefer styled ASS over the plain SRT rendering
+            for name in ('ass', 'subtitles'):
+                if name in futures and futures[name].result():
+                    logger.info(f"Subtitle filter probe selected: {name}")
+                    return name
+        
+        logger.warning("Subtitle filter probe: no working filter")
+        return None
+    
+    def burn_subtitles_to_video(self, video_path: str, srt_path: str, output_path: str, font_settings=None, progress_callback=None,
+                                ass_path: Optional[str] = None, burn_mode: Literal["hard", "soft"] = "hard",
+                                subtitle_language: Optional[str] = None,
+                                start: Optional[float] = None, end: Optional[float] = None) -> bool:
+        """Fixed subtitle burning with proper error handling
+        
+        burn_mode="soft" skips the re-encode and muxes the SRT as a subtitle track instead.
+        start/end (seconds) burn only that range of the source; FFmpeg seeks on the input, so
+        the work is proportional to the clip length. Trimming applies to hard burns only.
+        """
         
         if not self.ffmpeg_available:
             if progress_callback:
@@ -673,213 +1799,253 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 progress_callback(f"❌ Invalid SRT file: {validation_message}")
             return False
         
+        if burn_mode == "soft":
+            if start is not None or end is not None:
+                logger.warning("Trim range is ignored for soft subtitles")
+            return self.mux_soft_subtitles(video_path, srt_path, output_path, subtitle_language, progress_callback)
+        
         try:
             if progress_callback:
                 progress_callback("🔥 Burning subtitles into video...")
             
-            # Method 1: Use ASS file with custom styling (best for styling)
-            try:
+            duration = self.get_video_duration(video_path)
+            
+            # Seek on the input side so the demuxer jumps to the range instead of decoding from zero
+            trim_args = []
+            if start is not None:
+                trim_args += ['-ss', f'{start:.3f}']
+            if end is not None:
+                trim_args += ['-to', f'{end:.3f}']
+            if trim_args and duration is not None:
+                if (start or 0) >= duration:
+                    if progress_callback:
+                        progress_callback(f"❌ Trim start {start:.1f}s is past the end of the video ({duration:.1f}s)")
+                    return False
+                duration = min(end if end is not None else duration, duration) - (start or 0)
+            
+            # Reuse the ASS script written during transcription when available
+            prebuilt_ass = ass_path is not None and os.path.exists(ass_path)
+            if not prebuilt_ass:
                 if progress_callback:
                     progress_callback("🔥 Creating styled ASS file for better subtitle appearance...")
                 
                 # Create ASS file with font settings
                 ass_path = srt_path.replace('.srt', '.ass')
-                if self.create_styled_ass_file(srt_path, ass_path, font_settings or FontSettings()):
-                    if progress_callback:
-                        progress_callback("🔥 Burning subtitles with advanced styling...")
-                    
-                    # Normalize path for cross-platform compatibility
-                    normalized_ass = self.normalize_path(ass_path)
-                    
-                    cmd = [
-                        'ffmpeg', '-i', video_path,
-                        '-vf', f'ass={normalized_ass}',
-                        '-c:a', 'copy',  # Copy audio without re-encoding
-                        '-c:v', 'libx264',  # Ensure proper video codec
-                        '-preset', 'fast',  # Faster encoding
-                        '-y',  # Overwrite output file
-                        output_path
-                    ]
-                    
-                    if progress_callback:
-                        progress_callback(f"🎬 Running styled subtitle command...")
-                    
-                    # Run FFmpeg with timeout
-                    result = subprocess.run(
-                        cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=600  # 10 minute timeout
-                    )
-                    
-                    if result.returncode == 0:
-                        if progress_callback:
-                            progress_callback("✅ Subtitles burned successfully with advanced styling!")
-                        # Clean up ASS file
-                        try:
-                            os.remove(ass_path)
-                        except:
-                            pass
-                        return True
-                    else:
-                        if progress_callback:
-                            progress_callback(f"⚠️ ASS styling method failed: {result.stderr[:200]}")
-                
-            except subprocess.TimeoutExpired:
-                if progress_callback:
-                    progress_callback("⚠️ ASS method timed out, trying fallback...")
-            except Exception as e:
+                if not self.create_styled_ass_file(srt_path, ass_path, font_settings or FontSettings()):
+                    ass_path = None
+            
+            # Validate the filter and path on a tiny synthetic clip before committing to a full encode
+            method = self._probe_subtitle_filter(srt_path, ass_path)
+            if method is None:
                 if progress_callback:
-                    progress_callback(f"⚠️ ASS method error: {e}")
+                    progress_callback("❌ No subtitle filter could read the subtitles - check FFmpeg libass support and the file path")
+                return False
             
-            # Method 2: Simple subtitle filter (fallback)
-            try:
+            if method == 'ass':
                 if progress_callback:
-                    progress_callback("🔥 Attempting simple subtitle burning...")
-                
-                # Normalize path for cross-platform compatibility
-                normalized_srt = self.normalize_path(srt_path)
-                
-                cmd = [
-                    'ffmpeg', '-i', video_path,
-                    '-vf', f'subtitles={normalized_srt}',
-                    '-c:a', 'copy',  # Copy audio without re-encoding
-                    '-c:v', 'libx264',  # Ensure proper video codec
-                    '-preset', 'fast',  # Faster encoding
-                    '-y',  # Overwrite output file
-                    output_path
-                ]
-                
+                    progress_callback("🔥 Burning subtitles with advanced styling...")
+                video_filter = self._subtitle_filter('ass', ass_path)
+            else:
                 if progress_callback:
-                    progress_callback(f"🎬 Running command: {' '.join(cmd[:5])}...")
-                
-                # Run FFmpeg with timeout
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=600  # 10 minute timeout
+                    progress_callback("🔥 Burning subtitles with simple subtitle filter...")
+                # No ASS script, so apply the font settings through force_style instead
+                video_filter = self._subtitle_filter(
+                    'subtitles', srt_path, (font_settings or FontSettings()).to_ffmpeg_style()
                 )
-                
-                if result.returncode == 0:
-                    if progress_callback:
-                        progress_callback("✅ Subtitles burned successfully with simple method!")
-                    return True
-                else:
-                    if progress_callback:
-                        progress_callback(f"⚠️ Simple method failed: {result.stderr[:200]}")
-                
-            except subprocess.TimeoutExpired:
-                if progress_callback:
-                    progress_callback("⚠️ Simple method timed out, trying alternative...")
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"⚠️ Simple method error: {e}")
             
-            # Method 2: Copy SRT to same directory (for path issues)
             try:
-                if progress_callback:
-                    progress_callback("🔥 Trying with copied SRT file...")
-                
-                # Copy SRT to same directory as video
-                video_dir = os.path.dirname(video_path)
-                temp_srt = os.path.join(video_dir, "temp_subtitles.srt")
-                
-                shutil.copy2(srt_path, temp_srt)
+                workers = 1 if trim_args else self._parallel_burn_workers(duration)
                 
-                cmd = [
-                    'ffmpeg', '-i', video_path,
-                    '-vf', f'subtitles=temp_subtitles.srt',
-                    '-c:a', 'copy',
-                    '-c:v', 'libx264',
-                    '-preset', 'fast',
-                    '-y',
-                    output_path
-                ]
-                
-                # Change working directory to video directory
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    cwd=video_dir,
-                    timeout=600
-                )
-                
-                # Clean up temp file
-                if os.path.exists(temp_srt):
-                    os.remove(temp_srt)
-                
-                if result.returncode == 0:
+                if workers > 1:
                     if progress_callback:
-                        progress_callback("✅ Subtitles burned successfully with copied SRT method!")
-                    return True
+                        progress_callback(f"🎬 Running subtitle command on {workers} parallel segments...")
+                    
+                    result = self._burn_in_segments(video_path, video_filter, output_path, duration, workers)
                 else:
+                    if start:
+                        video_filter = self._shifted_filter(video_filter, start)
+                    cmd = self._build_burn_cmd(video_path, video_filter, output_path,
+                                               input_args=trim_args, duration=duration)
+                    
                     if progress_callback:
-                        progress_callback(f"⚠️ Copied SRT method failed: {result.stderr[:200]}")
-                        
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"⚠️ Copied SRT method error: {e}")
+                        progress_callback(f"🎬 Running subtitle command...")
+                    
+                    # Run FFmpeg with timeout
+                    result = self._run_ffmpeg(
+                        cmd, duration, progress_callback, "🔥 Burning subtitles:",
+                        timeout=600  # 10 minute timeout
+                    )
+                    
+                    # Hardware encoders can still fail at runtime (session limits, unsupported
+                    # pixel format or resolution); the software encoder handles anything
+                    if result.returncode != 0 and self.hw_encoder:
+                        logger.warning(f"{self.hw_encoder} encode failed, retrying with libx264: {result.stderr[-300:]}")
+                        if progress_callback:
+                            progress_callback(f"⚠️ {self.hw_encoder} failed, retrying with libx264...")
+                        cmd = self._build_burn_cmd(video_path, video_filter, output_path,
+                                                   input_args=trim_args, duration=duration, encoder='libx264')
+                        result = self._run_ffmpeg(
+                            cmd, duration, progress_callback, "🔥 Burning subtitles:",
+                            timeout=600
+                        )
+            finally:
+                # Clean up the intermediate ASS script
+                if ass_path and os.path.exists(ass_path):
+                    try:
+                        os.remove(ass_path)
+                    except OSError:
+                        pass
             
-            # Method 3: Using ass filter (last resort)
-            try:
-                if progress_callback:
-                    progress_callback("🔥 Trying ASS subtitle filter...")
-                
-                cmd = [
-                    'ffmpeg', '-i', video_path,
-                    '-vf', f'ass={srt_path}',
-                    '-c:a', 'copy',
-                    '-c:v', 'libx264',
-                    '-preset', 'fast',
-                    '-y',
-                    output_path
-                ]
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=600
-                )
-                
-                if result.returncode == 0:
-                    if progress_callback:
-                        progress_callback("✅ Subtitles burned successfully with ASS filter!")
-                    return True
-                else:
-                    if progress_callback:
-                        progress_callback(f"⚠️ ASS filter failed: {result.stderr[:200]}")
-                        
-            except Exception as e:
+            if result.returncode == 0:
                 if progress_callback:
-                    progress_callback(f"⚠️ ASS filter error: {e}")
+                    progress_callback("✅ Subtitles burned successfully!")
+                return True
             
-            # If all methods failed
             if progress_callback:
-                progress_callback("❌ All subtitle burning methods failed")
+                progress_callback(f"❌ Subtitle burning failed: {result.stderr[:200]}")
+            return False
+        
+        except subprocess.TimeoutExpired:
+            if progress_callback:
+                progress_callback("❌ Subtitle burning timed out")
             return False
-                
         except Exception as e:
             if progress_callback:
                 progress_callback(f"❌ Unexpected error in subtitle burning: {e}")
             return False
 
-    def create_video_with_subtitles(self, video_path: str, srt_path: str, output_dir: str, font_settings=None, progress_callback=None) -> Tuple[Optional[str], str]:
-        """Create video with burned-in subtitles"""
+    def _stream_signature(self, video_path: str) -> Optional[list]:
+        """Codec parameters of each stream, used to tell whether clips can share one concat input"""
+        try:
+            result = subprocess.run([
+                'ffprobe', '-v', 'error',
+                '-show_entries', 'stream=codec_type,codec_name,width,height,pix_fmt,r_frame_rate,sample_rate,channels',
+                '-of', 'json', video_path
+            ], capture_output=True, text=True, timeout=30)
+            return json.loads(result.stdout)['streams']
+        except (subprocess.TimeoutExpired, FileNotFoundError, ValueError, KeyError) as e:
+            logger.warning(f"Could not probe streams of {video_path}: {e}")
+            return None
+    
+    def burn_subtitles_batch(self, video_paths: List[str], srt_paths: List[str], output_paths: List[str],
+                             font_settings: Optional[FontSettings] = None, progress_callback=None) -> List[bool]:
+        """Burn subtitles into several clips with a single FFmpeg process
+        
+        The clips are joined with the concat demuxer, their SRTs merged onto the joined timeline,
+        and the encode is split back into one file per clip with the segment muxer (keyframes are
+        forced at the cut points). Clips whose streams differ cannot be concatenated; they, and
+        any batch that fails, are burned one by one instead. Returns one success flag per clip.
+        """
+        def burn_individually() -> List[bool]:
+            return [
+                self.burn_subtitles_to_video(video, srt, out, font_settings, progress_callback)
+                for video, srt, out in zip(video_paths, srt_paths, output_paths)
+            ]
+        
+        if not self.ffmpeg_available:
+            if progress_callback:
+                progress_callback("❌ FFmpeg not available for subtitle burning")
+            return [False] * len(video_paths)
+        
+        if len(video_paths) < 2:
+            return burn_individually()
+        
+        durations = [self.get_video_duration(path) for path in video_paths]
+        signatures = [self._stream_signature(path) for path in video_paths]
+        if None in durations or None in signatures or any(sig != signatures[0] for sig in signatures):
+            if progress_callback:
+                progress_callback("🔥 Clips differ in format, burning subtitles one clip at a time...")
+            return burn_individually()
+        
+        offsets = [sum(durations[:i]) for i in range(len(durations))]
+        cut_points = ','.join(f'{offset:.3f}' for offset in offsets[1:])
+        work_dir = tempfile.mkdtemp(prefix='batch_', dir=os.path.dirname(os.path.abspath(output_paths[0])))
+        
+        try:
+            list_path = os.path.join(work_dir, 'concat.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for path in video_paths:
+                    escaped_path = os.path.abspath(path).replace("'", "'\\''")
+                    f.write(f"file '{escaped_path}'\n")
+            
+            # Shift every clip's cues by the clip's start on the joined timeline
+            merged_srt = os.path.join(work_dir, 'merged.srt')
+            with open(merged_srt, 'w', encoding='utf-8') as dst:
+                for srt_path, offset in zip(srt_paths, offsets):
+                    offset_ms = int(round(offset * 1000))
+                    with open(srt_path, 'r', encoding='utf-8') as src:
+                        for line in src:
+                            time_match = _SRT_TIME.match(line)
+                            if time_match:
+                                start_ms = _srt_time_ms(*time_match.group(1, 2))
+                                end_ms = _srt_time_ms(*time_match.group(3, 4))
+                                line = (f"{_fmt_ts((start_ms + offset_ms + 0.5) / 1000)} --> "
+                                        f"{_fmt_ts((end_ms + offset_ms + 0.5) / 1000)}\n")
+                            dst.write(line)
+                    dst.write('\n')
+            
+            merged_ass = os.path.join(work_dir, 'merged.ass')
+            if not self.create_styled_ass_file(merged_srt, merged_ass, font_settings or FontSettings()):
+                return burn_individually()
+            
+            if progress_callback:
+                progress_callback(f"🔥 Burning subtitles into {len(video_paths)} clips in one FFmpeg run...")
+            
+            segment_pattern = os.path.join(work_dir, 'out%03d.mp4')
+            cmd = self._build_burn_cmd(
+                list_path, self._subtitle_filter('ass', merged_ass), segment_pattern,
+                input_args=['-f', 'concat', '-safe', '0'],
+                output_args=['-force_key_frames', cut_points,
+                             '-f', 'segment', '-segment_times', cut_points, '-reset_timestamps', '1',
+                             '-segment_format_options', 'movflags=+faststart'],
+                duration=sum(durations), faststart=False, audio_source=video_paths[0]
+            )
+            result = self._run_ffmpeg(cmd, sum(durations), progress_callback, "🔥 Burning subtitles:", timeout=600)
+            
+            segments = [os.path.join(work_dir, f'out{i:03d}.mp4') for i in range(len(video_paths))]
+            if result.returncode != 0 or not all(os.path.exists(path) for path in segments):
+                if progress_callback:
+                    progress_callback(f"⚠️ Batch burn failed, burning clips one at a time: {result.stderr[:200]}")
+                return burn_individually()
+            
+            for segment, output_path in zip(segments, output_paths):
+                shutil.move(segment, output_path)
+            
+            if progress_callback:
+                progress_callback("✅ Subtitles burned successfully!")
+            return [True] * len(video_paths)
+        
+        except subprocess.TimeoutExpired:
+            if progress_callback:
+                progress_callback("⚠️ Batch burn timed out, burning clips one at a time...")
+            return burn_individually()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def create_video_with_subtitles(self, video_path: str, srt_path: str, output_dir: str, font_settings=None, progress_callback=None,
+                                    ass_path: Optional[str] = None, burn: bool = True,
+                                    start: Optional[float] = None, end: Optional[float] = None,
+                                    subtitle_language: Optional[str] = None) -> Tuple[Optional[str], str]:
+        """Create video with burned-in subtitles, or with a soft subtitle track when burn is False
+        
+        subtitle_language (e.g. 'hi') tags the soft subtitle track.
+        """
         
         try:
             # Create unique output filename
             video_name = Path(video_path).stem
-            output_filename = f"{video_name}_with_subtitles_{int(time.time())}.mp4"
+            # Soft subtitles copy the video stream, so the container must be able to hold its codec
+            extension = '.mp4' if burn else self._soft_subtitle_container(video_path)
+            output_filename = f"{video_name}_with_subtitles_{int(time.time())}{extension}"
             output_path = Path(output_dir) / output_filename
             
             if progress_callback:
                 progress_callback(f"📹 Output will be saved as: {output_filename}")
             
             success = self.burn_subtitles_to_video(
-                video_path, srt_path, str(output_path), font_settings, progress_callback
+                video_path, srt_path, str(output_path), font_settings, progress_callback, ass_path=ass_path,
+                burn_mode="hard" if burn else "soft", subtitle_language=subtitle_language,
+                start=start, end=end
             )
             
             if success and output_path.exists():
@@ -893,13 +2059,17 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         except Exception as e:
             return None, f"Error creating video with subtitles: {e}"
 
+@functools.lru_cache(maxsize=1)
 def check_dependencies() -> Dict[str, bool]:
-    """Check available dependencies with detailed logging"""
+    """Check available dependencies with detailed logging
+    
+    The result is cached for the process; call refresh_dependencies() after installing tools.
+    """
     deps = {
         'whisper': WHISPER_AVAILABLE,
         'moviepy': MOVIEPY_AVAILABLE,
         'opencv': OPENCV_AVAILABLE,
-        'ffmpeg': VideoProcessor()._check_ffmpeg()
+        'ffmpeg': VideoProcessor._check_ffmpeg()
     }
     
     logger.info("Dependency check results:")
@@ -909,18 +2079,92 @@ def check_dependencies() -> Dict[str, bool]:
     
     # Check for critical dependencies
     if not deps['whisper']:
-        logger.error("Critical dependency missing: Whisper. Install with: pip install openai-whisper")
+        logger.error("Critical dependency missing: Whisper. Install with: pip install faster-whisper")
     
     if not deps['ffmpeg'] and not deps['moviepy']:
         logger.warning("No audio extraction method available. Install FFmpeg or MoviePy.")
     
     return deps
 
+# Loaded LocalWhisperTools by (model_name, compute_type), least recently used first
+_whisper_tools_cache = OrderedDict()
+_whisper_tools_lock = threading.Lock()
+WHISPER_TOOLS_CACHE_SIZE = 4
+
+def get_whisper_tools(model_name: str = "base", compute_type: Optional[str] = None) -> LocalWhisperTools:
+    """Return a LocalWhisperTools for model_name, loading the weights only the first time
+    
+    Up to four model/precision combinations stay resident, so jobs alternating between
+    e.g. base and small don't reload weights each time. An instance whose background
+    load failed is dropped and rebuilt, so one failure doesn't break every later job.
+    """
+    key = (model_name, compute_type)
+    with _whisper_tools_lock:
+        whisper_tools = _whisper_tools_cache.get(key)
+        if whisper_tools is not None:
+            load_future = whisper_tools._load_future
+            if load_future.done() and load_future.exception() is not None:
+                logger.warning(f"Previous load of Whisper model '{model_name}' failed, loading it again")
+                del _whisper_tools_cache[key]
+                whisper_tools = None
+            else:
+                _whisper_tools_cache.move_to_end(key)
+        
+        if whisper_tools is None:
+            whisper_tools = LocalWhisperTools(model_name=model_name, compute_type=compute_type)
+            _whisper_tools_cache[key] = whisper_tools
+            while len(_whisper_tools_cache) > WHISPER_TOOLS_CACHE_SIZE:
+                _whisper_tools_cache.popitem(last=False)
+        
+        return whisper_tools
+
+def refresh_dependencies() -> Dict[str, bool]:
+    """Drop the cached FFmpeg, encoder and dependency checks and run them again"""
+    VideoProcessor._check_ffmpeg.cache_clear()
+    VideoProcessor._detect_hw_encoder.cache_clear()
+    check_dependencies.cache_clear()
+    return check_dependencies()
+
+def _transcribe_to_srt(whisper_tools: LocalWhisperTools, audio: Union[str, np.ndarray], output_path: Path,
+                       progress_callback: Optional[Callable], language: Optional[str], auto_detect_language: bool,
+                       font_settings: Optional[FontSettings] = None,
+                       ass_path: Optional[Path] = None) -> Tuple[Optional[Path], str, Optional[str]]:
+    """Step 2 of the workflow: transcribe audio and save captions.srt in output_path
+    
+    Returns (srt_path, srt_content, language code), or (None, error message, None) if
+    transcription failed.
+    """
+    srt_content, transcript_language = whisper_tools.transcribe_audio_with_language(
+        audio, progress_callback, language, auto_detect_language=auto_detect_language,
+        ass_path=str(ass_path) if ass_path else None, font_settings=font_settings
+    )
+    
+    if srt_content.startswith("Error"):
+        return None, srt_content, None
+    
+    # Save SRT file
+    srt_path = output_path / "captions.srt"
+    with open(srt_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(srt_content)
+    
+    if progress_callback:
+        progress_callback(f"📝 Step 2 Complete: SRT file saved ({len(srt_content)} characters)")
+    
+    return srt_path, srt_content, transcript_language
+
 def process_video_with_captions(video_path: str, output_dir: str, model_name: str = "base", 
                                font_settings: Optional[FontSettings] = None, create_video: bool = True, 
                                progress_callback: Optional[Callable] = None, language: Optional[str] = None,
-                               auto_detect_language: bool = True):
-    """Complete video captioning workflow with enhanced error handling"""
+                               auto_detect_language: bool = True, compute_type: Optional[str] = None,
+                               burn: bool = True, burn_preset: Optional[str] = None,
+                               start: Optional[float] = None, end: Optional[float] = None):
+    """Complete video captioning workflow with enhanced error handling
+    
+    With burn=False the created video carries the subtitles as a soft track (no re-encode).
+    start/end limit the burned video to that range; the SRT always covers the whole video.
+    Returns (srt_path, srt_content, video_with_subs_path, message); the paths and content
+    are None on failure.
+    """
     
     # Create output directory
     output_path = Path(output_dir)
@@ -931,15 +2175,15 @@ def process_video_with_captions(video_path: str, output_dir: str, model_name: st
         if not os.path.exists(video_path):
             error_msg = f"Video file not found: {video_path}"
             logger.error(error_msg)
-            return None, None, error_msg
+            return None, None, None, error_msg
         
         # Get file info
         file_size = os.path.getsize(video_path) / (1024 * 1024)  # MB
         logger.info(f"Processing video: {video_path} ({file_size:.1f}MB)")
         
-        # Initialize tools
-        whisper_tools = LocalWhisperTools(model_name=model_name)
-        video_processor = VideoProcessor()
+        # Initialize tools (the Whisper model is shared across jobs)
+        whisper_tools = get_whisper_tools(model_name, compute_type)
+        video_processor = VideoProcessor(burn_preset=burn_preset)
         
         # Set default font settings
         if font_settings is None:
@@ -950,41 +2194,50 @@ def process_video_with_captions(video_path: str, output_dir: str, model_name: st
             progress_callback(f"📁 Output directory: {output_path}")
         
         # Step 1: Extract audio
-        audio_path = output_path / "extracted_audio.wav"
-        
         if progress_callback:
             progress_callback("🎵 Step 1: Extracting audio from video...")
         
-        if not video_processor.extract_audio(video_path, str(audio_path), progress_callback):
-            return None, None, "Failed to extract audio from video"
+        # Probe hardware encoders while audio is extracted and transcribed; only Step 3 needs them.
+        # The Whisper weights are already loading in the background (see LocalWhisperTools).
+        encoder_probe = None
+        if create_video and burn:
+            encoder_probe = threading.Thread(target=lambda: video_processor.hw_encoder, daemon=True)
+            encoder_probe.start()
+        
+        # Pipe samples straight into memory; fall back to a WAV file (e.g. MoviePy) if that fails
+        audio = video_processor.extract_audio_to_array(video_path, progress_callback)
+        if audio is None:
+            audio_path = output_path / "extracted_audio.wav"
+            if not video_processor.extract_audio(video_path, str(audio_path), progress_callback):
+                return None, None, None, "Failed to extract audio from video"
+            audio = str(audio_path)
         
         # Step 2: Transcribe
         if progress_callback:
             progress_callback("🎤 Step 2: Transcribing audio to text...")
         
-        srt_content = whisper_tools.transcribe_audio_local(
-            str(audio_path), progress_callback, language, auto_detect_language=auto_detect_language
-        )
-        
-        if srt_content.startswith("Error"):
-            return None, None, srt_content
+        # Write the styled ASS script alongside the SRT when the video will be burned
+        ass_path = output_path / "captions.ass" if create_video and burn else None
         
-        # Save SRT file
-        srt_path = output_path / "captions.srt"
-        with open(srt_path, 'w', encoding='utf-8') as f:
-            f.write(srt_content)
-        
-        if progress_callback:
-            progress_callback(f"📝 Step 2 Complete: SRT file saved ({len(srt_content)} characters)")
+        srt_path, srt_content, transcript_language = _transcribe_to_srt(
+            whisper_tools, audio, output_path, progress_callback, language, auto_detect_language,
+            font_settings, ass_path
+        )
+        if srt_path is None:
+            return None, None, None, srt_content
         
         # Step 3: Create video with subtitles (optional)
         video_with_subs_path = None
         if create_video:
+            if encoder_probe:
+                encoder_probe.join()
             if progress_callback:
                 progress_callback("🎬 Step 3: Creating video with embedded subtitles...")
             
             video_with_subs_path, video_message = video_processor.create_video_with_subtitles(
-                video_path, str(srt_path), str(output_path), font_settings, progress_callback
+                video_path, str(srt_path), str(output_path), font_settings, progress_callback,
+                ass_path=str(ass_path) if ass_path else None, burn=burn, start=start, end=end,
+                subtitle_language=transcript_language
             )
             
             if not video_with_subs_path:
@@ -995,12 +2248,152 @@ def process_video_with_captions(video_path: str, output_dir: str, model_name: st
         if progress_callback:
             progress_callback("🎉 Video captioning process completed!")
         
-        return str(srt_path), video_with_subs_path, "Success"
+        return str(srt_path), srt_content, video_with_subs_path, "Success"
     
     except Exception as e:
         if progress_callback:
             progress_callback(f"❌ Unexpected error: {str(e)}")
-        return None, None, f"Error during processing: {str(e)}"
+        return None, None, None, f"Error during processing: {str(e)}"
+
+def process_video_with_captions_stream(video_stream: io.BufferedIOBase, output_dir: str, model_name: str = "base",
+                                      progress_callback: Optional[Callable] = None, language: Optional[str] = None,
+                                      auto_detect_language: bool = True, compute_type: Optional[str] = None):
+    """SRT-only captioning of a video read from a binary stream (e.g. an HTTP upload)
+    
+    The stream is piped to FFmpeg's stdin, so the video never has to be saved first. Formats
+    that need seeking (MP4 with the index at the end) cannot be demuxed from a pipe; for those
+    the stream is rewound, written to output_dir and handed to process_video_with_captions.
+    Returns the same tuple as process_video_with_captions.
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    
+    try:
+        whisper_tools = get_whisper_tools(model_name, compute_type)
+        video_processor = VideoProcessor()
+        
+        if progress_callback:
+            progress_callback("🎬 Starting video captioning process...")
+            progress_callback(f"📁 Output directory: {output_path}")
+            progress_callback("🎵 Step 1: Extracting audio from uploaded stream...")
+        
+        audio = video_processor.extract_audio_from_stream(video_stream, progress_callback)
+        if audio is None:
+            if not video_stream.seekable():
+                return None, None, None, "Failed to extract audio from video stream"
+            
+            if progress_callback:
+                progress_callback("🎵 Stream not decodable from a pipe, saving upload to disk...")
+            video_stream.seek(0)
+            video_path = output_path / "input_video"
+            with open(video_path, 'wb') as f:
+                shutil.copyfileobj(video_stream, f, 1 << 20)
+            try:
+                return process_video_with_captions(
+                    str(video_path), output_dir, model_name, create_video=False,
+                    progress_callback=progress_callback, language=language,
+                    auto_detect_language=auto_detect_language, compute_type=compute_type
+                )
+            finally:
+                video_path.unlink(missing_ok=True)
+        
+        if progress_callback:
+            progress_callback("🎤 Step 2: Transcribing audio to text...")
+        
+        srt_path, srt_content, _ = _transcribe_to_srt(
+            whisper_tools, audio, output_path, progress_callback, language, auto_detect_language
+        )
+        if srt_path is None:
+            return None, None, None, srt_content
+        
+        if progress_callback:
+            progress_callback("🎉 Video captioning process completed!")
+        
+        return str(srt_path), srt_content, None, "Success"
+    
+    except Exception as e:
+        if progress_callback:
+            progress_callback(f"❌ Unexpected error: {str(e)}")
+        return None, None, None, f"Error during processing: {str(e)}"
+
+def process_videos_batch(video_paths: List[str], output_dir: str, model_name: str = "base",
+                         font_settings: Optional[FontSettings] = None, create_video: bool = True,
+                         progress_callback: Optional[Callable] = None, language: Optional[str] = None,
+                         auto_detect_language: bool = True, compute_type: Optional[str] = None,
+                         burn: bool = True) -> List[Tuple[Optional[str], Optional[str], Optional[str], str]]:
+    """Caption several videos with shared settings on one loaded model
+    
+    Each video gets its own numbered subdirectory of output_dir. Burned videos are encoded
+    together in one FFmpeg run (see VideoProcessor.burn_subtitles_batch). Returns one
+    process_video_with_captions-style tuple per video, in input order.
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    
+    whisper_tools = get_whisper_tools(model_name, compute_type)
+    video_processor = VideoProcessor()
+    if font_settings is None:
+        font_settings = FontSettings()
+    
+    results = []
+    languages = {}  # transcript language per video index, for soft subtitle track tags
+    for index, video_path in enumerate(video_paths):
+        if progress_callback:
+            progress_callback(f"🎬 Video {index + 1}/{len(video_paths)}: {Path(video_path).name}")
+        
+        clip_dir = output_path / str(index)
+        clip_dir.mkdir(exist_ok=True)
+        try:
+            audio = video_processor.extract_audio_to_array(video_path, progress_callback)
+            if audio is None:
+                audio_path = clip_dir / "extracted_audio.wav"
+                if not video_processor.extract_audio(video_path, str(audio_path), progress_callback):
+                    results.append((None, None, None, "Failed to extract audio from video"))
+                    continue
+                audio = str(audio_path)
+            
+            srt_path, srt_content, languages[index] = _transcribe_to_srt(
+                whisper_tools, audio, clip_dir, progress_callback, language, auto_detect_language
+            )
+            if srt_path is None:
+                results.append((None, None, None, srt_content))
+            else:
+                results.append((str(srt_path), srt_content, None, "Success"))
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"❌ Unexpected error: {str(e)}")
+            results.append((None, None, None, f"Error during processing: {str(e)}"))
+    
+    transcribed = [index for index, result in enumerate(results) if result[0]]
+    if create_video and transcribed:
+        if progress_callback:
+            progress_callback("🎬 Step 3: Creating videos with embedded subtitles...")
+        
+        if burn:
+            outputs = [str(output_path / str(index) / f"{Path(video_paths[index]).stem}_with_subtitles.mp4")
+                       for index in transcribed]
+            burned = video_processor.burn_subtitles_batch(
+                [video_paths[index] for index in transcribed], [results[index][0] for index in transcribed],
+                outputs, font_settings, progress_callback
+            )
+            videos = [output if ok else None for output, ok in zip(outputs, burned)]
+        else:
+            videos = [
+                video_processor.create_video_with_subtitles(
+                    video_paths[index], results[index][0], str(output_path / str(index)),
+                    font_settings, progress_callback, burn=False, subtitle_language=languages.get(index)
+                )[0]
+                for index in transcribed
+            ]
+        
+        for index, video_with_subs_path in zip(transcribed, videos):
+            srt_path, srt_content, _, message = results[index]
+            results[index] = (srt_path, srt_content, video_with_subs_path, message)
+    
+    if progress_callback:
+        progress_callback("🎉 Batch captioning process completed!")
+    
+    return results
 
 def main():
     """Main function for API bridge with enhanced Hindi/Hinglish support"""
@@ -1045,7 +2438,7 @@ def main():
         progress_callback(f"🔍 Dependencies check: {deps}")
         
         # Process video with captions
-        srt_path, video_path_with_subs, message = process_video_with_captions(
+        srt_path, srt_content, video_path_with_subs, message = process_video_with_captions(
             video_path,
             output_dir,
             model_name,
@@ -1057,10 +2450,6 @@ def main():
         )
         
         if srt_path:
-            # Read the generated SRT file
-            with open(srt_path, 'r', encoding='utf-8') as f:
-                srt_content = f.read()
-            
             result = {
                 "type": "complete",
                 "srtContent": srt_content,
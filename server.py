@@ -5,23 +5,32 @@ Integrates with the existing script.py for video processing
 """
 
 import os
+import io
 import json
 import tempfile
 import shutil
 from pathlib import Path
-from flask import Flask, request, jsonify, send_file
+from collections import OrderedDict
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import threading
+import queue
 import time
 import uuid
 import logging
+import re
+import math
+import hmac
 
 # Import our existing subtitle generation functions
 from script import (
     process_video_with_captions,
+    process_video_with_captions_stream,
+    process_videos_batch,
     FontSettings,
     check_dependencies,
+    refresh_dependencies,
     LocalWhisperTools,
     VideoProcessor
 )
@@ -35,6 +44,9 @@ CORS(app, origins=["http://localhost:3000", "http://127.0.0.1:3000"])
 
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max file size
+# Behind nginx/Apache, let the proxy stream downloads itself via X-Sendfile. Otherwise send_file
+# hands the open file to the WSGI server's wsgi.file_wrapper (os.sendfile under gunicorn).
+app.use_x_sendfile = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
 UPLOAD_FOLDER = 'uploads'
 OUTPUT_FOLDER = 'outputs'
 ALLOWED_EXTENSIONS = {'mp4', 'mov', 'avi', 'mkv', 'webm'}
@@ -43,8 +55,105 @@ ALLOWED_EXTENSIONS = {'mp4', 'mov', 'avi', 'mkv', 'webm'}
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
-# Store for tracking processing jobs
-processing_jobs = {}
+# Store for tracking processing jobs; written by worker threads, so always access under jobs_lock.
+# Ordered by last update so stale jobs can be evicted from the front.
+processing_jobs = OrderedDict()
+jobs_lock = threading.Lock()
+
+# Jobs untouched for JOB_TTL seconds are forgotten; at most MAX_JOBS are kept
+JOB_TTL = 3600
+MAX_JOBS = 1000
+
+# Wake-up queues for jobs with an open /api/job-stream; created when a stream attaches and
+# removed when it closes or the job is evicted. They hold at most one token and no payloads:
+# the listener reads the job's latest state when woken.
+job_queues = {}
+
+# Seconds between SSE keep-alive comments while a job is quiet
+STREAM_KEEPALIVE = 15
+
+def update_job(job_id, **fields):
+    """Merge fields into a job record and return a snapshot of it"""
+    now = time.time()
+    with jobs_lock:
+        job = processing_jobs.setdefault(job_id, {})
+        job.update(fields, updated_at=now)
+        processing_jobs.move_to_end(job_id)
+        
+        # Evict expired jobs (and any overflow) from the least recently updated end
+        while processing_jobs:
+            oldest_id, oldest = next(iter(processing_jobs.items()))
+            if len(processing_jobs) <= MAX_JOBS and now - oldest['updated_at'] <= JOB_TTL:
+                break
+            del processing_jobs[oldest_id]
+            notify_stream(job_queues.pop(oldest_id, None))
+            logger.info(f"Evicted job {oldest_id} from memory")
+        
+        return dict(job)
+
+def notify_stream(events):
+    """Wake a stream listener; a pending wake-up already covers any newer state"""
+    if events is None:
+        return
+    try:
+        events.put_nowait(None)
+    except queue.Full:
+        pass
+
+def get_job(job_id):
+    """Snapshot of a job record, or None if unknown"""
+    with jobs_lock:
+        job = processing_jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+def read_srt(srt_path):
+    """Contents of a job's SRT file, or '' if it is gone"""
+    try:
+        with open(srt_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, TypeError):
+        return ''
+
+def job_response(job_data):
+    """Client-facing status payload for a job record"""
+    if job_data['completed'] and not job_data.get('error') and 'batch_results' in job_data:
+        return {
+            'type': 'complete',
+            'results': [
+                {
+                    'filename': result['filename'],
+                    'srtContent': read_srt(result['srt_path']),
+                    'srtPath': result['srt_path'],
+                    'message': result['message'],
+                    'videoCreated': result['video_with_subs_path'] is not None,
+                    'videoWithSubtitles': result['video_with_subs_path'],
+                    'softSubs': result['soft_subs']
+                }
+                for result in job_data['batch_results']
+            ],
+            'outputDir': job_data.get('output_dir'),
+            'message': job_data.get('message', 'Processing completed')
+        }
+    if job_data['completed'] and not job_data.get('error'):
+        # Include SRT content in response when completed; it lives on disk, not in the job record
+        return {
+            'type': 'complete',
+            'srtContent': read_srt(job_data.get('srt_path')),
+            'srtPath': job_data.get('srt_path'),
+            'outputDir': job_data.get('output_dir'),
+            'message': job_data.get('message', 'Processing completed'),
+            'videoCreated': job_data.get('video_with_subs_path') is not None,
+            'videoWithSubtitles': job_data.get('video_with_subs_path'),
+            'softSubs': job_data.get('soft_subs', False)
+        }
+    return {
+        'type': 'progress' if not job_data.get('error') else 'error',
+        'progress': job_data['progress'],
+        'current_step': job_data['current_step'],
+        'message': job_data['message'],
+        'completed': job_data['completed'],
+        'error': job_data.get('error')
+    }
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -62,90 +171,145 @@ class ProgressTracker:
         self.error = None
         
     def update(self, step, message, progress=None):
-        """Update progress and store in global jobs dict"""
+        """Update progress in the global jobs dict and wake any attached stream listener"""
         self.current_step = step
         self.message = message
         if progress is not None:
             self.progress = progress
-            
-        # Ensure job exists in dictionary before updating
-        if self.job_id not in processing_jobs:
-            processing_jobs[self.job_id] = {}
-            
-        processing_jobs[self.job_id].update({
-            'progress': self.progress,
-            'current_step': self.current_step,
-            'message': self.message,
-            'completed': self.completed,
-            'error': self.error
-        })
+        
+        update_job(
+            self.job_id,
+            progress=self.progress,
+            current_step=self.current_step,
+            message=self.message,
+            completed=self.completed,
+            error=self.error
+        )
+        
+        notify_stream(job_queues.get(self.job_id))
         
         logger.info(f"Job {self.job_id}: {step} - {message} ({self.progress}%)")
-        logger.debug(f"Updated job {self.job_id} state: {processing_jobs[self.job_id]}")
 
-def process_video_background(job_id, video_path, output_dir, model_name, language, create_video, font_settings):
-    """Background task to process video"""
+# Percentage reported by streamed FFmpeg/transcription progress messages, e.g. "🔥 Burning subtitles: 40%"
+PROGRESS_PERCENT = re.compile(r'(\d{1,3})%$')
+
+# Overall progress range each streamed stage maps onto
+STAGE_PROGRESS_RANGES = {
+    "Extracting Audio": (25, 34),
+    "Transcribing Audio": (45, 74),
+    "Burning Subtitles": (85, 99)
+}
+
+def detach_upload(file):
+    """Readable handle on an upload's data that stays valid after the request closes it"""
+    stream = file.stream
+    stream.seek(0)
+    try:
+        # Large uploads are already spooled to a temp file; share it rather than saving a copy
+        return os.fdopen(os.dup(stream.fileno()), 'rb')
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return io.BytesIO(stream.read())
+
+def font_settings_from_form(form):
+    """Font settings (can be extended from form data)"""
+    return FontSettings(
+        family=form.get('font_family', 'Arial'),
+        size=int(form.get('font_size', 24)),
+        color=form.get('font_color', 'white'),
+        outline_color=form.get('outline_color', 'black'),
+        bold=form.get('bold', 'false').lower() == 'true',
+        italic=form.get('italic', 'false').lower() == 'true',
+        shadow=form.get('shadow', 'true').lower() == 'true'
+    )
+
+def make_progress_callback(tracker):
+    """Progress callback that maps pipeline messages onto a tracker's step and percentage"""
+    def progress_callback(message):
+        # Parse progress from message if possible
+        progress = None
+        step = "Processing"
+        
+        if "🎵" in message:
+            step = "Extracting Audio"
+            progress = 25
+        elif "🔍" in message or "🌐" in message:
+            step = "Language Detection"
+            progress = 35
+        elif "🎤" in message:
+            if "Starting transcription" in message or "Transcribing:" in message:
+                step = "Transcribing Audio"
+                progress = 45
+            elif "completed" in message:
+                step = "Transcription Complete"
+                progress = 75
+        elif "🔥" in message:
+            step = "Burning Subtitles"
+            progress = 85
+        elif "✅" in message:
+            step = "Complete"
+            progress = 100
+        
+        # Streamed percentages move progress through the stage's range instead of its fixed bucket
+        percent_match = PROGRESS_PERCENT.search(message)
+        if percent_match and step in STAGE_PROGRESS_RANGES:
+            low, high = STAGE_PROGRESS_RANGES[step]
+            progress = low + (high - low) * min(int(percent_match.group(1)), 100) // 100
+        
+        tracker.update(step, message, progress)
+    
+    return progress_callback
+
+def process_video_background(job_id, video_source, output_dir, model_name, language, create_video, font_settings, burn_in, preset, start, end):
+    """Background task to process video
+    
+    video_source is a saved file path, or an open upload stream for SRT-only jobs.
+    """
     tracker = ProgressTracker(job_id)
     
     try:
         tracker.update("Initializing", "Starting video processing", 0)
         
-        # Create progress callback
-        def progress_callback(message):
-            # Parse progress from message if possible
-            progress = None
-            step = "Processing"
-            
-            if "🎵" in message:
-                step = "Extracting Audio"
-                progress = 25
-            elif "🔍" in message or "🌐" in message:
-                step = "Language Detection"
-                progress = 35
-            elif "🎤" in message:
-                if "Starting transcription" in message:
-                    step = "Transcribing Audio"
-                    progress = 45
-                elif "completed" in message:
-                    step = "Transcription Complete"
-                    progress = 75
-            elif "🔥" in message:
-                step = "Burning Subtitles"
-                progress = 85
-            elif "✅" in message:
-                step = "Complete"
-                progress = 100
-            
-            tracker.update(step, message, progress)
+        progress_callback = make_progress_callback(tracker)
         
         # Process the video using our existing function
-        srt_path, video_with_subs_path, message = process_video_with_captions(
-            video_path=video_path,
-            output_dir=output_dir,
-            model_name=model_name,
-            font_settings=font_settings,
-            create_video=create_video,
-            progress_callback=progress_callback,
-            language=language if language != 'auto' else None,
-            auto_detect_language=language == 'auto'
-        )
+        if not isinstance(video_source, str):
+            with video_source:
+                srt_path, _, video_with_subs_path, message = process_video_with_captions_stream(
+                    video_source,
+                    output_dir,
+                    model_name,
+                    progress_callback=progress_callback,
+                    language=language if language != 'auto' else None,
+                    auto_detect_language=language == 'auto'
+                )
+        else:
+            srt_path, _, video_with_subs_path, message = process_video_with_captions(
+                video_path=video_source,
+                output_dir=output_dir,
+                model_name=model_name,
+                font_settings=font_settings,
+                create_video=create_video,
+                progress_callback=progress_callback,
+                language=language if language != 'auto' else None,
+                auto_detect_language=language == 'auto',
+                burn=burn_in,
+                burn_preset=preset,
+                start=start,
+                end=end
+            )
         
         if srt_path:
-            # Read the SRT content
-            with open(srt_path, 'r', encoding='utf-8') as f:
-                srt_content = f.read()
-            
             # Mark as completed
             tracker.completed = True
             tracker.progress = 100
-            processing_jobs[job_id].update({
-                'completed': True,
-                'srt_content': srt_content,
-                'srt_path': srt_path,
-                'video_with_subs_path': video_with_subs_path,
-                'output_dir': output_dir,
-                'message': message
-            })
+            update_job(
+                job_id,
+                completed=True,
+                srt_path=srt_path,
+                video_with_subs_path=video_with_subs_path,
+                soft_subs=video_with_subs_path is not None and not burn_in,
+                output_dir=output_dir
+            )
             
             tracker.update("Completed", "Video processing completed successfully!", 100)
         else:
@@ -154,10 +318,54 @@ def process_video_background(job_id, video_path, output_dir, model_name, languag
     except Exception as e:
         logger.error(f"Processing error for job {job_id}: {str(e)}")
         tracker.error = str(e)
-        processing_jobs[job_id].update({
-            'error': str(e),
-            'completed': True
-        })
+        tracker.completed = True
+        tracker.update("Error", f"Processing failed: {str(e)}", None)
+
+def process_batch_background(job_id, video_paths, filenames, output_dir, model_name, language, create_video, font_settings, burn_in):
+    """Background task to caption several videos as one job"""
+    tracker = ProgressTracker(job_id)
+    
+    try:
+        tracker.update("Initializing", f"Starting batch of {len(video_paths)} videos", 0)
+        
+        results = process_videos_batch(
+            video_paths,
+            output_dir,
+            model_name,
+            font_settings=font_settings,
+            create_video=create_video,
+            progress_callback=make_progress_callback(tracker),
+            language=language if language != 'auto' else None,
+            auto_detect_language=language == 'auto',
+            burn=burn_in
+        )
+        
+        if not any(srt_path for srt_path, _, _, _ in results):
+            raise Exception(results[0][3] if results else "Processing failed")
+        
+        tracker.completed = True
+        update_job(
+            job_id,
+            completed=True,
+            batch_results=[
+                {
+                    'filename': filename,
+                    'srt_path': srt_path,
+                    'video_with_subs_path': video_with_subs_path,
+                    'soft_subs': video_with_subs_path is not None and not burn_in,
+                    'message': message
+                }
+                for filename, (srt_path, _, video_with_subs_path, message) in zip(filenames, results)
+            ],
+            output_dir=output_dir
+        )
+        
+        tracker.update("Completed", "Batch processing completed successfully!", 100)
+    
+    except Exception as e:
+        logger.error(f"Processing error for batch job {job_id}: {str(e)}")
+        tracker.error = str(e)
+        tracker.completed = True
         tracker.update("Error", f"Processing failed: {str(e)}", None)
 
 @app.route('/api/health', methods=['GET'])
@@ -168,6 +376,25 @@ def health_check():
         'dependencies': check_dependencies()
     })
 
+def admin_allowed():
+    """Admin requests need the ADMIN_TOKEN header when one is configured, else must come from loopback"""
+    admin_token = os.environ.get('ADMIN_TOKEN')
+    if admin_token:
+        return hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token)
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+@app.route('/api/admin/refresh-dependencies', methods=['POST'])
+def refresh_dependency_cache():
+    """Re-run the cached dependency and encoder checks (e.g. after installing FFmpeg)"""
+    # Clearing the caches makes the next burn repeat the encoder trial encodes, so don't expose it
+    if not admin_allowed():
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    return jsonify({
+        'status': 'refreshed',
+        'dependencies': refresh_dependencies()
+    })
+
 @app.route('/api/process-video', methods=['POST'])
 def process_video():
     """Main endpoint for video processing"""
@@ -187,48 +414,59 @@ def process_video():
         language = request.form.get('language', 'auto')
         model_name = request.form.get('model', 'base')
         create_video = request.form.get('create_video', 'true').lower() == 'true'
+        # Burn-in (the default) re-encodes with the font settings; burn_in=false muxes soft subtitles instead
+        burn_in = request.form.get('burn_in', 'true').lower() == 'true'
+        preset = request.form.get('preset') or None  # x264 preset for burn-in; defaults to BURN_PRESET
         
-        # Font settings (can be extended from form data)
-        font_settings = FontSettings(
-            family=request.form.get('font_family', 'Arial'),
-            size=int(request.form.get('font_size', 24)),
-            color=request.form.get('font_color', 'white'),
-            outline_color=request.form.get('outline_color', 'black'),
-            bold=request.form.get('bold', 'false').lower() == 'true',
-            italic=request.form.get('italic', 'false').lower() == 'true',
-            shadow=request.form.get('shadow', 'true').lower() == 'true'
-        )
+        # Optional trim range (seconds) for the burned video
+        try:
+            start = float(request.form['start']) if request.form.get('start') else None
+            end = float(request.form['end']) if request.form.get('end') else None
+        except ValueError:
+            return jsonify({'error': 'start and end must be numbers of seconds'}), 400
+        if any(value is not None and not math.isfinite(value) for value in (start, end)):
+            return jsonify({'error': 'start and end must be finite numbers of seconds'}), 400
+        if (start is not None and start < 0) or (end is not None and end < 0):
+            return jsonify({'error': 'start and end must not be negative'}), 400
+        if start is not None and end is not None and end <= start:
+            return jsonify({'error': 'end must be after start'}), 400
+        
+        font_settings = font_settings_from_form(request.form)
         
         # Generate unique job ID
         job_id = str(uuid.uuid4())
         
-        # Save uploaded file
         filename = secure_filename(file.filename)
-        timestamp = str(int(time.time()))
-        unique_filename = f"{timestamp}_{filename}"
-        video_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-        file.save(video_path)
+        if create_video:
+            # Burning needs a seekable file on disk for the whole job
+            timestamp = str(int(time.time()))
+            unique_filename = f"{timestamp}_{filename}"
+            video_source = os.path.join(UPLOAD_FOLDER, unique_filename)
+            file.save(video_source)
+        else:
+            # SRT only: stream the upload straight into FFmpeg instead of saving another copy
+            video_source = detach_upload(file)
         
         # Create output directory for this job
         output_dir = os.path.join(OUTPUT_FOLDER, job_id)
         os.makedirs(output_dir, exist_ok=True)
         
         # Initialize job tracking
-        processing_jobs[job_id] = {
-            'progress': 0,
-            'current_step': 'Initializing',
-            'message': 'Starting video processing',
-            'completed': False,
-            'error': None
-        }
+        update_job(
+            job_id,
+            progress=0,
+            current_step='Initializing',
+            message='Starting video processing',
+            completed=False,
+            error=None
+        )
         
         logger.info(f"Created job {job_id} for video: {filename}")
-        logger.info(f"Current jobs in memory: {list(processing_jobs.keys())}")
         
         # Start background processing
         thread = threading.Thread(
             target=process_video_background,
-            args=(job_id, video_path, output_dir, model_name, language, create_video, font_settings)
+            args=(job_id, video_source, output_dir, model_name, language, create_video, font_settings, burn_in, preset, start, end)
         )
         thread.daemon = True
         thread.start()
@@ -243,74 +481,166 @@ def process_video():
         logger.error(f"Error in process_video: {str(e)}")
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+@app.route('/api/process-batch', methods=['POST'])
+def process_batch():
+    """Caption several videos with shared settings as one job
+    
+    Videos are sent as repeated 'videos' file fields; other fields match /api/process-video.
+    Burned videos are encoded together in a single FFmpeg run when their formats match.
+    """
+    try:
+        files = request.files.getlist('videos')
+        if not files:
+            return jsonify({'error': 'No video files provided'}), 400
+        
+        for file in files:
+            if file.filename == '' or not allowed_file(file.filename):
+                return jsonify({'error': 'Invalid file type. Supported formats: MP4, MOV, AVI, MKV, WebM'}), 400
+        
+        language = request.form.get('language', 'auto')
+        model_name = request.form.get('model', 'base')
+        create_video = request.form.get('create_video', 'true').lower() == 'true'
+        burn_in = request.form.get('burn_in', 'true').lower() == 'true'
+        font_settings = font_settings_from_form(request.form)
+        
+        job_id = str(uuid.uuid4())
+        
+        # Save uploaded files
+        timestamp = str(int(time.time()))
+        filenames, video_paths = [], []
+        for index, file in enumerate(files):
+            filename = secure_filename(file.filename)
+            video_path = os.path.join(UPLOAD_FOLDER, f"{timestamp}_{index}_{filename}")
+            file.save(video_path)
+            filenames.append(filename)
+            video_paths.append(video_path)
+        
+        output_dir = os.path.join(OUTPUT_FOLDER, job_id)
+        os.makedirs(output_dir, exist_ok=True)
+        
+        update_job(
+            job_id,
+            progress=0,
+            current_step='Initializing',
+            message='Starting batch processing',
+            completed=False,
+            error=None
+        )
+        
+        logger.info(f"Created batch job {job_id} for {len(files)} videos")
+        
+        thread = threading.Thread(
+            target=process_batch_background,
+            args=(job_id, video_paths, filenames, output_dir, model_name, language, create_video, font_settings, burn_in)
+        )
+        thread.daemon = True
+        thread.start()
+        
+        return jsonify({
+            'job_id': job_id,
+            'status': 'started',
+            'message': f'Batch processing of {len(files)} videos started'
+        })
+    
+    except Exception as e:
+        logger.error(f"Error in process_batch: {str(e)}")
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
 @app.route('/api/job-status/<job_id>', methods=['GET'])
 def get_job_status(job_id):
     """Get processing status for a job"""
-    logger.info(f"Status request for job: {job_id}")
-    logger.info(f"Available jobs: {list(processing_jobs.keys())}")
-    
-    if job_id not in processing_jobs:
+    job_data = get_job(job_id)
+    if job_data is None:
         logger.error(f"Job {job_id} not found in processing_jobs")
         return jsonify({'error': 'Job not found'}), 404
     
-    job_data = processing_jobs[job_id]
-    logger.info(f"Job {job_id} data: {job_data}")
+    response_data = job_response(job_data)
+    logger.debug(f"Returning response for job {job_id}: {response_data['type']}")
+    return jsonify(response_data)
+
+@app.route('/api/job-stream/<job_id>', methods=['GET'])
+def stream_job_status(job_id):
+    """Push job status updates as Server-Sent Events until the job completes or fails
     
-    if job_data['completed'] and not job_data.get('error'):
-        # Include SRT content in response when completed
-        response_data = {
-            'type': 'complete',
-            'srtContent': job_data.get('srt_content', ''),
-            'srtPath': job_data.get('srt_path'),
-            'outputDir': job_data.get('output_dir'),
-            'message': job_data.get('message', 'Processing completed'),
-            'videoCreated': job_data.get('video_with_subs_path') is not None,
-            'videoWithSubtitles': job_data.get('video_with_subs_path')
-        }
-    else:
-        response_data = {
-            'type': 'progress' if not job_data.get('error') else 'error',
-            'progress': job_data['progress'],
-            'current_step': job_data['current_step'],
-            'message': job_data['message'],
-            'completed': job_data['completed'],
-            'error': job_data.get('error')
-        }
+    Each event carries the same payload as /api/job-status. Intended for one listener per job.
+    """
+    with jobs_lock:
+        # Attach under the lock so the job can't be evicted in between, orphaning the queue
+        if job_id not in processing_jobs:
+            return jsonify({'error': 'Job not found'}), 404
+        events = job_queues.setdefault(job_id, queue.Queue(maxsize=1))
     
-    logger.info(f"Returning response for job {job_id}: {response_data}")
-    return jsonify(response_data)
+    def generate():
+        try:
+            yield from stream_events()
+        finally:
+            with jobs_lock:
+                if job_queues.get(job_id) is events:
+                    del job_queues[job_id]
+    
+    def stream_events():
+        while True:
+            job_data = get_job(job_id)
+            if job_data is None:
+                # Evicted while the stream was open
+                yield f"data: {json.dumps({'type': 'error', 'error': 'Job not found', 'completed': True})}\n\n"
+                return
+            event = job_response(job_data)
+            yield f"data: {json.dumps(event)}\n\n"
+            if event['type'] != 'progress':
+                return
+            try:
+                events.get(timeout=STREAM_KEEPALIVE)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def job_output(job_data, key):
+    """Output path of a job; batch jobs pick the video with the ?index= query argument"""
+    if 'batch_results' not in job_data:
+        return job_data.get(key)
+    index = request.args.get('index', 0, type=int)
+    if not 0 <= index < len(job_data['batch_results']):
+        return None
+    return job_data['batch_results'][index].get(key)
 
 @app.route('/api/download-srt/<job_id>', methods=['GET'])
 def download_srt(job_id):
     """Download SRT file for a completed job"""
-    if job_id not in processing_jobs:
+    job_data = get_job(job_id)
+    if job_data is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job_data = processing_jobs[job_id]
     if not job_data.get('completed') or job_data.get('error'):
         return jsonify({'error': 'Job not completed or has error'}), 400
     
-    srt_path = job_data.get('srt_path')
+    srt_path = job_output(job_data, 'srt_path')
     if not srt_path or not os.path.exists(srt_path):
         return jsonify({'error': 'SRT file not found'}), 404
     
-    return send_file(srt_path, as_attachment=True, download_name='subtitles.srt')
+    return send_file(srt_path, as_attachment=True, download_name='subtitles.srt',
+                     conditional=True, max_age=0)
 
 @app.route('/api/download-video/<job_id>', methods=['GET'])
 def download_video(job_id):
     """Download video with subtitles for a completed job"""
-    if job_id not in processing_jobs:
+    job_data = get_job(job_id)
+    if job_data is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job_data = processing_jobs[job_id]
     if not job_data.get('completed') or job_data.get('error'):
         return jsonify({'error': 'Job not completed or has error'}), 400
     
-    video_path = job_data.get('video_with_subs_path')
+    video_path = job_output(job_data, 'video_with_subs_path')
     if not video_path or not os.path.exists(video_path):
         return jsonify({'error': 'Video file not found'}), 404
     
-    return send_file(video_path, as_attachment=True, download_name='video_with_subtitles.mp4')
+    # conditional=True answers Range/If-None-Match requests so players can seek and resume
+    # Soft-subtitle videos may be MKV when the source codec can't go into MP4
+    return send_file(video_path, as_attachment=True, download_name=f'video_with_subtitles{Path(video_path).suffix}',
+                     conditional=True, max_age=0)
 
 @app.errorhandler(413)
 def file_too_large(e):
@@ -331,7 +661,7 @@ if __name__ == '__main__':
     print(f"MoviePy: {'Available' if deps['moviepy'] else 'Missing'}")
     
     if not deps['whisper']:
-        print("❌ Warning: Whisper not available. Install with: pip install openai-whisper")
+        print("❌ Warning: Whisper not available. Install with: pip install faster-whisper")
     
     print("\n🌐 Server will be available at: http://localhost:5000")
     print("🔗 Frontend should connect to: http://localhost:5000/api/process-video")